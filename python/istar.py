@@ -902,6 +902,32 @@ Quick Start Guide for iStar
         PropagateLabel("/*/SD-Model")
         Show("/*/Meeting Participant")
 
+    Alternatively, only the labels changed by ``SetLabel`` and ``MakeJudgement`` are propagated, which evaluates
+    just the nodes depending on them and prints the changed labels. ::
+
+        PropagateChanges("/*/SD-Model")
+
+    Contribution links may form cycles, e.g., between softgoals. Such models are propagated with ``fixpoint``: each
+    cycle is evaluated repeatedly until its labels do not change anymore. Cycles, which do not converge, are
+    printed. ::
+
+        PropagateLabel("/*/SD-Model", fixpoint=True)
+
+    Large models are analyzed faster on a frozen copy, which holds the intentions and links in arrays. ::
+
+        frozen = node("/*/SD-Model").freeze()
+        leaves = [frozen.names[k] for k in frozen.leaves()]
+        labels = frozen.evaluate()
+
+    Frozen models with many actors are propagated until the labels converge by several processes, each evaluating
+    actors which do not depend on each other. ::
+
+        labels = frozen.evaluate(jobs=4)
+
+    Which leaves can influence which roots (along contribution, decomposition and dependency links) is shown by ::
+
+        influencing, affected = node("/*/SD-Model").sensitivity(interactive=True)
+
 
     .. figure:: ../../python/_istar/SRMPa.png
         :width: 100%
@@ -910,8 +936,15 @@ Quick Start Guide for iStar
     Resulting model
 """
 
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
 from ref import *
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # contribution labels are looked up link by link
 
 def Show(pathModel):
     """
@@ -936,6 +969,7 @@ def SetLabel(pathNode, newLabel):
     tmpNode = node(pathNode)
     if isinstance(tmpNode, Intention):
         if newLabel in GoalModel.Label:
+            tmpNode.parent.rootModel().changedLabels.setdefault(tmpNode, tmpNode.properties.get('Label'))
             tmpNode.properties['InputLabel'] = newLabel
             tmpNode.properties['Label'] = newLabel
         else:
@@ -952,20 +986,37 @@ def MakeJudgement(pathNode, newLabel):
     """
     tmpNode = node(pathNode)
     if isinstance(tmpNode, SoftGoal):
+        tmpNode.parent.rootModel().changedLabels.setdefault(tmpNode, tmpNode.properties.get('Label'))
         tmpNode.properties['Judgment'] = newLabel
         tmpNode.properties['Label'] = newLabel
 
 
-def PropagateLabel(goalmodel):
+def PropagateLabel(goalmodel, fixpoint=False, maxIterations=None):
     """
     Starts the label propagation of a goal model.
 
+    Parameters:
+        :param goalmodel: The goal model to be analyzed
+        :param fixpoint: evaluate cycles of links until their labels converge
+        :param maxIterations: maximal number of evaluations of a cycle, see LabelPropagator.maxIterations
+        :return: the cycles, whose labels did not converge, each a list of intentions
+    """
+    model = node(goalmodel)
+    if isinstance(model, GoalModel):
+        return model.forwardEvaluation(fixpoint=fixpoint, maxIterations=maxIterations)
+    return []
+
+
+def PropagateChanges(goalmodel):
+    """
+    Propagates the labels changed by SetLabel and MakeJudgement since the last propagation of a goal model.
+
     Parameters:
         :param goalmodel: The goal model to be analyzed
     """
     model = node(goalmodel)
     if isinstance(model, GoalModel):
-        model.forwardEvaluation()
+        return model.updateEvaluation()
 
 
 def key_for_value(d, value):
@@ -989,8 +1040,13 @@ class GoalModel(Model):
         :var text: optional explanation of the model to be shown in the document
         :var properties: yet no special properties for models (rendering options envisioned)
         :var pNode: parent node
+        :var imageFormat: format of the rendered model, 'png' or 'pdf' (vector graphics)
+        :var dependencies: index of the dependency links of the model, dependuum -> list of DependencyLinks
+        :var changedLabels: intention -> label before SetLabel/MakeJudgement, for the intentions of the model and its
+            submodels changed since their last propagation (only in the outermost model, see rootModel)
         """
     mnemonic = 'SRM'
+    imageFormat = 'png'
 
     Label = {'None': 0,
              'Satisfied': 6,
@@ -1014,6 +1070,8 @@ class GoalModel(Model):
         Model.__init__(self, caption, text, properties, pNode)
         self.links = []
         self.intentions = []
+        self.dependencies = {}
+        self.changedLabels = OrderedDict()
 
     def genTeX(self, texAry, level, index, number):
         """
@@ -1038,19 +1096,20 @@ class GoalModel(Model):
         :param self:
         :return:
         """
-        self.genImage(show=False)
+        self.genImage(show=False, defer=True)
         return Figure.bodyTeX(self)
 
-    def genImage(self, overwrite=True, show=False):
+    def genImage(self, overwrite=True, show=False, defer=False):
         """
 
         :param self:
         :param overwrite:
         :param show:
+        :param defer: queue the rendering, the queued images are rendered concurrently before pdflatex runs
         """
         tmpname = self.cleanFileName()
         dot = Digraph(comment=tmpname)
-        dot.format = 'png'
+        dot.format = self.imageFormat
         # dot.engine = 'circo'
         # dot.charset = 'UTF-8'
         dot.graph_attr.update(rankdir='LR')
@@ -1063,13 +1122,13 @@ class GoalModel(Model):
 
         if overwrite is False:
             n = 0
-            while os.path.isfile(Document.imgPath + tmpname + '_' + str(n) + '.png') is True:
+            while os.path.isfile(Document.imgPath + tmpname + '_' + str(n) + '.' + self.imageFormat) is True:
                 n += 1
             saveImg = Document.imgPath + tmpname + '_' + str(n)
         else:
             saveImg = Document.imgPath + tmpname
-        dot.render(saveImg, view=False)
-        self.figure = tmpname + '.png'
+        renderDot(dot, saveImg, defer)
+        self.figure = tmpname + '.' + self.imageFormat
 
     def findLeaf(self):
         """
@@ -1089,15 +1148,209 @@ class GoalModel(Model):
             if isinstance(n, GoalModel):
                 n.findRoot()
 
-    def forwardEvaluation(self, interactive=True):
+    def forwardEvaluation(self, interactive=True, fixpoint=False, maxIterations=None):
         """
 
         :param self:
         :param interactive:
+        :param fixpoint: evaluate cycles of links until their labels converge, see Actor.forwardEvaluation
+        :param maxIterations: maximal number of evaluations of a cycle, see LabelPropagator.maxIterations
+        :return: the cycles, whose labels did not converge, each a list of intentions
         """
+        diverging = []
         for n in self.nodes:
             if isinstance(n, GoalModel):
-                n.forwardEvaluation(interactive=interactive)
+                diverging.extend(n.forwardEvaluation(interactive=interactive, fixpoint=fixpoint,
+                                                     maxIterations=maxIterations))
+        changedLabels = self.rootModel().changedLabels
+        for i in self.intentions:
+            changedLabels.pop(i, None)
+        return diverging
+
+    def dependencyLinks(self):
+        """ Returns the dependency links of the model and its submodels by dependuum.
+
+        :return: dependuum -> list of DependencyLinks
+        """
+        links = {dependuum: list(dlinks) for dependuum, dlinks in self.dependencies.items()}
+        for n in self.nodes:
+            if isinstance(n, GoalModel):
+                for dependuum, dlinks in n.dependencyLinks().items():
+                    links.setdefault(dependuum, []).extend(dlinks)
+        return links
+
+    def indexDependency(self, link):
+        """ Adds a dependency link of the model to the index dependencies. """
+        self.dependencies.setdefault(link.dependuum, []).append(link)
+
+    def collectActors(self, actors):
+        """ Appends the actors of the model and its submodels to the list actors, in the order forwardEvaluation
+        evaluates them, and returns it. """
+        for n in self.nodes:
+            if isinstance(n, Actor):
+                actors.append(n)
+            elif isinstance(n, GoalModel):
+                n.collectActors(actors)
+        return actors
+
+    def freeze(self):
+        """ Returns the model (with its submodels) as FrozenGoalModel, i.e., as compact arrays for analysis. """
+        return FrozenGoalModel(self)
+
+    def collectIntentions(self, intentions):
+        """ Appends the intentions of the model and its submodels to the list intentions and returns it. """
+        intentions.extend(self.intentions)
+        for n in self.nodes:
+            if isinstance(n, GoalModel):
+                n.collectIntentions(intentions)
+        return intentions
+
+    @staticmethod
+    def lookupIntention(intention, index):
+        """ Returns the number of the intention (or of the intention at the path) in index.
+
+        :param index: intention -> number, see collectIntentions
+        :raise AttributeError: the intention is not in index
+        """
+        if not isinstance(intention, Intention):
+            intention = node(intention)
+        if intention not in index:
+            raise AttributeError("Intention not in goal model: " + str(intention))
+        return index[intention]
+
+    def evaluateScenarios(self, scenarios, roots=None, jobs=1):
+        """ Evaluates alternative label assignments without changing the model, see LabelNetwork. A scenario is
+        like the labelList of SetLabels, e.g.: ::
+
+            roots, labels = node("/*/SD-Model").evaluateScenarios([
+                {'/*/Proposed Date D': 'Satisfied', '/*/Schedule Meeting': 'Denied'},
+                {'/*/Proposed Date D': 'Denied', '/*/Schedule Meeting': 'Satisfied'}])
+
+        :param scenarios: list of dictionaries, path of an intention (or the intention) -> label
+        :param roots: intentions (or their paths) of the result, the root intentions of the model if None
+        :param jobs: number of processes evaluating the scenarios
+        :return: (roots, labels), where labels[s][r] is the code of the label of root r in scenario s (a NumPy
+            array, if available), ContributionLink.labelNames[code] is the label
+        """
+        intentions = self.collectIntentions([])
+        index = {n: k for k, n in enumerate(intentions)}
+        network = LabelNetwork(self.freeze())
+
+        def lookup(intention):
+            return self.lookupIntention(intention, index)
+
+        inputs = []
+        for scenario in scenarios:
+            labels = [0] * len(intentions)
+            for intention, label in scenario.items():
+                if label not in GoalModel.Label:
+                    raise AttributeError("newLabel must be one of the following Labels: " +
+                                         ','.join(GoalModel.Label.keys()))
+                labels[lookup(intention)] = GoalModel.Label[label]
+            inputs.append(labels)
+
+        if jobs > 1 and len(inputs) > 1:
+            size = (len(inputs) + jobs - 1) // jobs
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                chunks = executor.map(network.evaluateScenarios,
+                                      [inputs[i:i + size] for i in range(0, len(inputs), size)])
+                results = [labels for chunk in chunks for labels in chunk]
+        else:
+            results = network.evaluateScenarios(inputs)
+
+        if roots is None:
+            columns = network.model.roots()
+        else:
+            columns = [lookup(intention) for intention in roots]
+        labels = [[result[k] for k in columns] for result in results]
+        if numpy is not None:
+            labels = numpy.array(labels, dtype=numpy.int8).reshape(len(results), len(columns))
+        return [intentions[k] for k in columns], labels
+
+    def sensitivity(self, roots=None, leaves=None, interactive=False):
+        """ Analyzes which leaves can influence which roots along contribution, decomposition and dependency links,
+        see FrozenGoalModel.reachability.
+
+        :param roots: intentions (or their paths), the root intentions of the model if None
+        :param leaves: intentions (or their paths), the leaf intentions of the model if None
+        :param interactive: print the leaves influencing each root
+        :return: (influencing, affected), where influencing maps each root to the list of the leaves influencing it,
+            and affected maps each leaf to the list of the roots it affects
+        """
+        intentions = self.collectIntentions([])
+        index = {n: k for k, n in enumerate(intentions)}
+        frozen = self.freeze()
+        if roots is None:
+            roots = [intentions[k] for k in frozen.roots()]
+        else:
+            roots = [intentions[self.lookupIntention(n, index)] for n in roots]
+        if leaves is None:
+            leaves = [intentions[k] for k in frozen.leaves()]
+        else:
+            leaves = [intentions[self.lookupIntention(n, index)] for n in leaves]
+        rows = frozen.reachability([index[n] for n in roots], [index[n] for n in leaves])
+        influencing = OrderedDict()
+        affected = OrderedDict((leaf, []) for leaf in leaves)
+        for root, row in zip(roots, rows):
+            influencing[root] = [leaves[i] for i in FrozenGoalModel.members(row)]
+            for leaf in influencing[root]:
+                affected[leaf].append(root)
+        if interactive:
+            for root, found in influencing.items():
+                print("\n Root: " + root.name + " (Path: /*/" + root.parent.name + '/*/' + root.name +
+                      " ) influenced by:")
+                for leaf in found:
+                    print(leaf.name)
+        return influencing, affected
+
+    def rootModel(self):
+        """ Returns the outermost goal model containing the model, the model itself if it is not a submodel. """
+        model = self
+        while isinstance(model.parent, GoalModel):
+            model = model.parent
+        return model
+
+    def contains(self, intention):
+        """ Returns True if the intention belongs to the model or one of its submodels. """
+        n = intention.parent
+        while n is not None and n is not self:
+            n = n.parent
+        return n is self
+
+    def updateEvaluation(self, interactive=True):
+        """ Re-propagates the labels changed by SetLabel and MakeJudgement since the last propagation. Only the
+        intentions downstream of the changed ones are evaluated, along contribution, decomposition and dependency
+        links, by the rules of forwardEvaluation (see LabelPropagator.update). If the model was evaluated by
+        forwardEvaluation until the labels did not change anymore, the labels are the same as if forwardEvaluation
+        were repeated again.
+
+        :param interactive: print the changes and the intentions needing a human judgment, show the model
+        :return: the changed labels, intention -> (old label, new label)
+        """
+        changedLabels = self.rootModel().changedLabels
+        startNodes = [i for i in changedLabels if self.contains(i)]
+        labels = OrderedDict()
+        for i in startNodes:
+            labels[i] = changedLabels.pop(i)
+        propagator = LabelPropagator(self.dependencyLinks(), actors=self.collectActors([]))
+        for i, label in propagator.propagate(startNodes).items():
+            labels.setdefault(i, label)
+        changes = OrderedDict()
+        for i, label in labels.items():
+            if i.properties.get('Label') != label:
+                changes[i] = (label, i.properties.get('Label'))
+
+        if interactive:
+            for i, (old, new) in changes.items():
+                print(i.name + ": " + str(old) + " -> " + str(new))
+            for i in changes:
+                if 'humanJudgment' in i.properties:
+                    print("\n Human Judgment in Node: " + i.name +
+                          " (Path: /*/" + i.parent.name + '/*/' + i.name + " ) Label Set:")
+                    for tmpNode, label in i.incomingLabels.items():
+                        print(tmpNode, ":", label)
+            self.genImage(show=True)
+        return changes
 
     def clearLabel(self):
         """
@@ -1163,15 +1416,16 @@ class Actor(GoalModel):
                  style='filled',
                  shape='circle')
 
-    def genImage(self, overwrite=True, show=False):
+    def genImage(self, overwrite=True, show=False, defer=False):
         """
 
         :param overwrite:
         :param show:
+        :param defer: queue the rendering, the queued images are rendered concurrently before pdflatex runs
         """
         tmpname = self.cleanFileName()
         dot = Digraph(comment=tmpname)
-        dot.format = 'png'
+        dot.format = self.imageFormat
         # dot.engine = 'circo'
         # dot.charset = 'UTF-8'
 
@@ -1183,13 +1437,13 @@ class Actor(GoalModel):
 
         if overwrite is False:
             n = 0
-            while os.path.isfile(Document.imgPath + tmpname + '_' + str(n) + '.png') is True:
+            while os.path.isfile(Document.imgPath + tmpname + '_' + str(n) + '.' + self.imageFormat) is True:
                 n += 1
             saveImg = Document.imgPath + tmpname + '_' + str(n)
         else:
             saveImg = Document.imgPath + tmpname
-        dot.render(saveImg, view=False)  # TODO view=show only on Windows
-        self.figure = tmpname + '.png'
+        renderDot(dot, saveImg, defer)  # TODO view=show only on Windows
+        self.figure = tmpname + '.' + self.imageFormat
 
     def findLeaf(self):
         """
@@ -1211,10 +1465,16 @@ class Actor(GoalModel):
                         'NodeType' in i.properties and i.properties['NodeType'] != 'depender':
                     i.properties['NodeType'] = 'root'
 
-    def forwardEvaluation(self, interactive=True):
+    def forwardEvaluation(self, interactive=True, fixpoint=False, maxIterations=None):
         """
+        Propagate the labels of the leaves and dependers of the actor. A depender, whose dependency has no label yet,
+        propagates nothing and keeps its input label.
 
         :param interactive:
+        :param fixpoint: allow cycles of links: the intentions of each cycle are evaluated repeatedly until their
+            labels do not change anymore, otherwise a cycle raises an AttributeError
+        :param maxIterations: maximal number of evaluations of a cycle, see LabelPropagator.maxIterations
+        :return: the cycles, whose labels did not converge, each a list of intentions
         """
         self.findLeaf()
         startNodes = []
@@ -1227,20 +1487,29 @@ class Actor(GoalModel):
                 # if 'Label' in n.properties and n.properties['Label'] == 'Unknown':
                 # del n.properties['Label']
 
+        inputs = {}
+        waiting = []
         for n in startNodes:
             if 'InputLabel' in n.properties:
                 n.properties['Label'] = n.properties['InputLabel']
+        for n in list(startNodes):
             if n.properties['NodeType'] == 'depender':
-                if 'Label' in n.dependencyFrom.dependuum.properties:
-                    n.compute(n.dependencyFrom.dependuum.properties['Label'], n.dependencyFrom.dependuum.name)
-                elif 'InputLabel' in n.dependencyFrom.dependuum.properties:
-                    n.compute(n.dependencyFrom.dependuum.properties['InputLabel'], n.dependencyFrom.dependuum.name)
-                elif 'Label' in n.dependencyFrom.begin.properties:
-                    n.compute(n.dependencyFrom.begin.properties['Label'], n.dependencyFrom.begin.name)
-                elif 'InputLabel' in n.dependencyFrom.begin.properties:
-                    n.compute(n.dependencyFrom.begin.properties['InputLabel'], n.dependencyFrom.begin.name)
-            else:
-                n.compute()
+                label = n.dependencyLabel()
+                if label is not None:
+                    inputs[n] = label
+                else:
+                    startNodes.remove(n)  # nothing to propagate yet
+                    waiting.append(n)
+        propagator = LabelPropagator(fixpoint=fixpoint, maxIterations=maxIterations)
+        propagator.propagate(startNodes, inputs)
+        # a depender waiting for its dependency keeps its input label, although the labels it received in this
+        # round are propagated
+        for n in waiting:
+            if 'InputLabel' in n.properties:
+                n.properties['Label'] = n.properties['InputLabel']
+        changedLabels = self.rootModel().changedLabels
+        for n in self.intentions:
+            changedLabels.pop(n, None)
 
         if interactive:
             for i in self.intentions:
@@ -1249,7 +1518,12 @@ class Actor(GoalModel):
                           " (Path: /*/" + i.parent.name + '/*/' + i.name + " ) Label Set:")
                     for tmpNode, label in i.incomingLabels.items():
                         print(tmpNode, ":", label)
+            for component in propagator.diverging:
+                print("\n No convergence after " + str(propagator.maxIterations) + " evaluations in Nodes:")
+                for i in component:
+                    print(i.name, ":", i.properties.get('Label', 'None'))
             self.genImage(show=True)
+        return propagator.diverging
 
 
 class Intention(ModelElement):
@@ -1289,26 +1563,39 @@ class Intention(ModelElement):
                 fillcolor = 'yellow'
         return fillcolor
 
-    def compute(self, newLabel='None', sourceName=None, ):
+    def dependencyLabel(self):
+        """ Returns the label a depender receives via its dependency, i.e., the label of the dependuum or else of
+        the dependee.
 
+        :return: (source name, label), None if neither is labeled
         """
+        dependency = self.dependencyFrom
+        for source in (dependency.dependuum, dependency.begin):
+            for key in ('Label', 'InputLabel'):
+                if key in source.properties:
+                    return source.name, source.properties[key]
+        return None
+
+    def receiveLabels(self, inputs):
+        """ Records the labels received by the intention.
 
-        :param newLabel:
-        :param sourceName:
+        :param inputs: list of (source name, label)
+        :return: True if a label other than 'None' was received
         """
-        for n in self.contributionTo:
-            if 'Label' in self.properties:
-                n.end.compute(n.computeLabel(), self.name)
-            else:
-                n.end.compute('None', self.name)
-        for n in self.decompositionTo:
-            if 'Label' in self.properties:
-                n.end.compute(self.properties['Label'], self.name)
-            else:
-                n.end.compute('None')
-        for n in self.dependenciesTo:
-            if 'Label' in self.properties:
-                n.dependuum.properties['Label'] = self.properties['Label']
+        received = False
+        for sourceName, label in inputs:
+            if label != 'None':
+                self.incomingLabels[sourceName] = label
+                received = True
+        return received
+
+    def evaluate(self, inputs):
+        """ Evaluates the label of the intention from all labels it receives in a propagation round, see
+        LabelPropagator. The label is not propagated further.
+
+        :param inputs: list of (source name, label)
+        """
+        self.receiveLabels(inputs)
 
     def getLabelImg(self):
         """
@@ -1362,27 +1649,13 @@ class Goal(Intention):
                      style='filled',
                      shape='ellipse')
 
-    def compute(self, newLabel='None', sourceName=None):
-        """
+    def evaluate(self, inputs):
+        """ The label of a goal is the best label it receives.
 
-        :param newLabel:
-        :param sourceName:
+        :param inputs: list of (source name, label)
         """
-        if newLabel != 'None':
-            self.incomingLabels[sourceName] = newLabel
-
-            if 'Label' in self.properties:
-                if self.properties['Label'] not in self.incomingLabels.values():
-                    self.properties['Label'] = newLabel
-                for l in self.incomingLabels.values():
-                    if GoalModel.Label[self.properties['Label']] < GoalModel.Label[l]:
-                        self.properties['Label'] = l
-            else:
-                self.properties['Label'] = newLabel
-        if 'Label' in self.properties:
-            Intention.compute(self, newLabel=self.properties['Label'])
-        else:
-            Intention.compute(self)
+        if self.receiveLabels(inputs):
+            self.properties['Label'] = max(self.incomingLabels.values(), key=GoalModel.Label.get)
 
 
 class SoftGoal(Intention):
@@ -1421,43 +1694,38 @@ class SoftGoal(Intention):
                      image=imageName,
                      imagescale='width')
 
-    def compute(self, newLabel='None', sourceName=None):
-        """
-
-        :param newLabel:
-        :param sourceName:
-        """
+    def combineLabels(self):
+        """ Sets the label of the softgoal from its incoming labels. If the labels do not determine the result, the
+        label is 'Unknown' and the softgoal needs a human judgment. """
+        labels = list(self.incomingLabels.values())
+        if len(labels) == 1:
+            resultLabel = labels[0]
+        elif 'Unknown' not in labels and 'Conflict' not in labels:
+            if 'Satisfied' in labels and 'Denied' not in labels and 'Partially Denied' not in labels:
+                resultLabel = 'Satisfied'
+            elif 'Denied' in labels and 'Satisfied' not in labels and 'Partially Satisfied' not in labels:
+                resultLabel = 'Denied'
+            else:
+                self.properties['humanJudgment'] = 'need'
+                resultLabel = 'Unknown'
+        else:
+            self.properties['humanJudgment'] = 'need'
+            resultLabel = 'Unknown'
+        if 'InputLabel' in self.properties and self.properties['InputLabel'] != resultLabel:
+            self.properties['humanJudgment'] = 'need'
+            self.properties['Label'] = 'Unknown'
+        else:
+            self.properties['Label'] = resultLabel
 
-        if not 'Judgment' in self.properties:
-            if newLabel != 'None':
-                self.incomingLabels[sourceName] = newLabel
-                labels = list(self.incomingLabels.values())
-                if len(labels) == 1:
-                    resultLabel = labels[0]
-                elif 'Unknown' not in labels and 'Conflict' not in labels:
-                    if 'Satisfied' in labels and 'Denied' not in labels and 'Partially Denied' not in labels:
-                        resultLabel = 'Satisfied'
-                    elif 'Denied' in labels and 'Satisfied' not in labels and 'Partially Satisfied' not in labels:
-                        resultLabel = 'Denied'
-                    else:
-                        self.properties['humanJudgment'] = 'need'
-                        resultLabel = 'Unknown'
-                else:
-                    self.properties['humanJudgment'] = 'need'
-                    resultLabel = 'Unknown'
-                if 'InputLabel' in self.properties and self.properties['InputLabel'] != resultLabel:
-                    self.properties['humanJudgment'] = 'need'
-                    self.properties['Label'] = 'Unknown'
-                else:
-                    self.properties['Label'] = resultLabel
+    def evaluate(self, inputs):
+        """ The label of a softgoal is a human judgment, if made, or else the combination of its incoming labels.
 
-        else:
+        :param inputs: list of (source name, label)
+        """
+        if 'Judgment' in self.properties:
             self.properties['Label'] = self.properties['Judgment']
-
-        if 'Label' in self.properties:
-            Intention.compute(self, newLabel=self.properties)
-        else:
-            Intention.compute(self)
+        elif self.receiveLabels(inputs):
+            self.combineLabels()
 
 
 class Task(Intention):
@@ -1488,26 +1756,13 @@ class Task(Intention):
                      style='filled',
                      shape='hexagon')
 
-    def compute(self, newLabel='None', sourceName=None):
-        """
+    def evaluate(self, inputs):
+        """ The label of a task is the worst label it receives.
 
-        :param newLabel:
-        :param sourceName:
+        :param inputs: list of (source name, label)
         """
-        if newLabel != 'None':
-            if 'Label' in self.properties:
-                self.incomingLabels[sourceName] = newLabel
-                if self.properties['Label'] not in self.incomingLabels.values():
-                    self.properties['Label'] = newLabel
-                for l in self.incomingLabels.values():
-                    if GoalModel.Label[self.properties['Label']] > GoalModel.Label[l]:
-                        self.properties['Label'] = l
-            else:
-                self.properties['Label'] = newLabel
-        if 'Label' in self.properties:
-            Intention.compute(self, newLabel=self.properties['Label'])
-        else:
-            Intention.compute(self)
+        if self.receiveLabels(inputs):
+            self.properties['Label'] = min(self.incomingLabels.values(), key=GoalModel.Label.get)
 
 
 class Resource(Intention):
@@ -1538,16 +1793,7 @@ class Resource(Intention):
                      style='filled',
                      shape='box')
 
-    def compute(self, newLabel='None', sourceName=None):
-        """
 
-        :param newLabel:
-        :param sourceName:
-        """
-        if 'Label' in self.properties:
-            Intention.compute(self, newLabel=self.properties['Label'])
-        else:
-            Intention.compute(self)
 
 
 class MeanEndLink(Link):
@@ -1572,8 +1818,21 @@ class MeanEndLink(Link):
 
 
 class ContributionLink(Link):
+    """ A contribution of an intention to a softgoal.
+
+    The labels and the contribution types are coded by small integers (the ordinal of GoalModel.Label and the
+    index in types), and the contributed label of each combination is looked up in labelTable, which is built from
+    the rules in contribute. For many links, the lookup is done for all links at once, see computeLabels.
+    """
+    types = ['MAKE', 'HELP', 'SOME+', 'UNKNOWN', 'SOME-', 'HURT', 'BREAK']
+    typeCodes = {t: i for i, t in enumerate(types)}
+    labelNames = []  # label code -> label
+    labelTable = []  # label code, type code -> code of the contributed label
+    labelMatrix = None  # labelTable as NumPy array
+    batchSize = 64  # minimum number of links to look up with NumPy
+
     def __init__(self, begin, end, TYPE='UNKNOWN'):
-        types = ['MAKE', 'HELP', 'SOME+', 'UNKNOWN', 'SOME-', 'HURT', 'BREAK']
+        types = self.types
         if TYPE in types:
             if (type(begin).__name__ == 'Task' or type(begin).__name__ == 'Goal' or type(
                     begin).__name__ == 'SoftGoal') or type(begin).__name__ == 'Resource' and type(
@@ -1600,62 +1859,91 @@ class ContributionLink(Link):
         pass
 
     def computeLabel(self):
-        """
-
+        """ Returns the label contributed to the end of the link, 'None' if its begin is not labeled.
 
         :return:
         """
-        if 'Label' in self.begin.properties:
-            if self.begin.properties['Label'] == 'Satisfied':
-                if self.type == 'MAKE':
-                    label = 'Satisfied'
-                elif self.type == 'BREAK':
-                    label = 'Denied'
-                elif self.type == 'SOME+' or self.type == 'HELP':
-                    label = 'Partially Satisfied'
-                elif self.type == 'SOME-' or self.type == 'HURT':
-                    label = 'Partially Denied'
-                else:
-                    label = 'Unknown'
-            elif self.begin.properties['Label'] == 'Partially Satisfied':
-                if self.type == 'MAKE' or self.type == 'HELP' or self.type == 'SOME+':
-                    label = 'Partially Satisfied'
-                elif self.type == 'BREAK' or self.type == 'HURT' or self.type == 'SOME-':
-                    label = 'Partially Denied'
-                else:
-                    label = 'Unknown'
-            elif self.begin.properties['Label'] == 'Conflict':
-                if self.type == 'UNKNOWN':
-                    label = 'Unknown'
-                else:
-                    label = 'Conflict'
-            elif self.begin.properties['Label'] == 'Unknown':
+        code = GoalModel.Label.get(self.begin.properties.get('Label'), 0)
+        return self.labelNames[self.labelTable[code][self.typeCodes[self.type]]]
+
+    @classmethod
+    def computeLabels(cls, links):
+        """ Returns the labels contributed by the links, as computeLabel. If NumPy is available, the labels of many
+        links are looked up in a single gather from labelMatrix.
+
+        :param links: list of ContributionLinks
+        :return: list of labels
+        """
+        if numpy is None or len(links) < cls.batchSize:
+            return [link.computeLabel() for link in links]
+        labels = numpy.fromiter((GoalModel.Label.get(link.begin.properties.get('Label'), 0) for link in links),
+                                dtype=numpy.int8, count=len(links))
+        types = numpy.fromiter((cls.typeCodes[link.type] for link in links), dtype=numpy.int8, count=len(links))
+        return [cls.labelNames[code] for code in cls.labelMatrix[labels, types].tolist()]
+
+    @staticmethod
+    def contribute(label, TYPE):
+        """ The rules for the label contributed by a link of type TYPE from an intention labeled label.
+
+        :param label: label of the begin of the link
+        :param TYPE: contribution type
+        :return: contributed label
+        """
+        if label == 'Satisfied':
+            if TYPE == 'MAKE':
+                label = 'Satisfied'
+            elif TYPE == 'BREAK':
+                label = 'Denied'
+            elif TYPE == 'SOME+' or TYPE == 'HELP':
+                label = 'Partially Satisfied'
+            elif TYPE == 'SOME-' or TYPE == 'HURT':
+                label = 'Partially Denied'
+            else:
                 label = 'Unknown'
-            elif self.begin.properties['Label'] == 'Partially Denied':
-                if self.type == 'MAKE' or self.type == 'HELP' or self.type == 'SOME+':
-                    label = 'Partially Denied'
-                elif self.type == 'BREAK' or self.type == 'HURT' or self.type == 'SOME-':
-                    label = 'Partially Satisfied'
-                else:
-                    label = 'Unknown'
-            elif self.begin.properties['Label'] == 'Denied':
-                if self.type == 'MAKE':
-                    label = 'Denied'
-                elif self.type == 'BREAK':
-                    label = 'Partially Satisfied'
-                elif self.type == 'SOME+' or self.type == 'HELP':
-                    label = 'Partially Denied'
-                elif self.type == 'SOME-' or self.type == 'HURT':
-                    label = 'Partially Satisfied'
-                else:
-                    label = 'Unknown'
+        elif label == 'Partially Satisfied':
+            if TYPE == 'MAKE' or TYPE == 'HELP' or TYPE == 'SOME+':
+                label = 'Partially Satisfied'
+            elif TYPE == 'BREAK' or TYPE == 'HURT' or TYPE == 'SOME-':
+                label = 'Partially Denied'
             else:
-                label = 'None'
+                label = 'Unknown'
+        elif label == 'Conflict':
+            if TYPE == 'UNKNOWN':
+                label = 'Unknown'
+            else:
+                label = 'Conflict'
+        elif label == 'Unknown':
+            label = 'Unknown'
+        elif label == 'Partially Denied':
+            if TYPE == 'MAKE' or TYPE == 'HELP' or TYPE == 'SOME+':
+                label = 'Partially Denied'
+            elif TYPE == 'BREAK' or TYPE == 'HURT' or TYPE == 'SOME-':
+                label = 'Partially Satisfied'
+            else:
+                label = 'Unknown'
+        elif label == 'Denied':
+            if TYPE == 'MAKE':
+                label = 'Denied'
+            elif TYPE == 'BREAK':
+                label = 'Partially Satisfied'
+            elif TYPE == 'SOME+' or TYPE == 'HELP':
+                label = 'Partially Denied'
+            elif TYPE == 'SOME-' or TYPE == 'HURT':
+                label = 'Partially Satisfied'
+            else:
+                label = 'Unknown'
         else:
             label = 'None'
         return label
 
 
+ContributionLink.labelNames = sorted(GoalModel.Label, key=GoalModel.Label.get)
+ContributionLink.labelTable = [[ContributionLink.labelNames.index(ContributionLink.contribute(label, TYPE))
+                                for TYPE in ContributionLink.types] for label in ContributionLink.labelNames]
+if numpy is not None:
+    ContributionLink.labelMatrix = numpy.array(ContributionLink.labelTable, dtype=numpy.int8)
+
+
 class DecompositionLink(Link):
     def __init__(self, begin, end):
         if type(end).__name__ == 'Task':
@@ -1689,44 +1977,42 @@ def refineDependency(dependuum, dependee=None, depender=None):
     result = False
     if dependee is not None:
         if isinstance(dependee, Actor):
-            for dlink in dependee.parent.links:
-                if isinstance(dlink, DependencyLink) and dlink.dependuum == dependuum:
-                    result = True
-                    if depender is not None and not isinstance(depender, Actor):
-                        depender.dependencyFrom = dlink
-                        dlink.end = depender
-                        depender.properties['NodeType'] = 'depender'
-                    else:
-                        raise AttributeError("Begin or end must be an element of an Actor")
+            model = dependee.parent
+            for dlink in model.dependencies.get(dependuum, []):
+                result = True
+                if depender is not None and not isinstance(depender, Actor):
+                    depender.dependencyFrom = dlink
+                    dlink.end = depender
+                    depender.properties['NodeType'] = 'depender'
+                else:
+                    raise AttributeError("Begin or end must be an element of an Actor")
 
         else:
-            for dlink in dependee.parent.parent.links:
-                if isinstance(dlink, DependencyLink) and dlink.dependuum == dependuum:
-                    result = True
-                    if dependee.dependenciesTo is not None:
-                        dependee.dependenciesTo.append(dlink)
-                    else:
-                        dependee.dependenciesTo = [dlink]
-                    dlink.begin = dependee
-                    if depender is not None and not isinstance(depender, Actor):
-                        depender.dependencyFrom = dlink
-                        dlink.end = depender
-                        depender.properties['NodeType'] = 'depender'
-                    else:
-                        raise AttributeError("Begin or end must be an element of an Actor")
-
-        if not result:
-            raise AttributeError("Dependency not found")
-    elif depender is not None:
-        if not isinstance(depender, Actor):
-            for dlink in dependee.parent.parent.links:
+            model = dependee.parent.parent
+            for dlink in model.dependencies.get(dependuum, []):
                 result = True
-                if isinstance(dlink, DependencyLink) and dlink.dependuum == dependuum:
+                if dependee.dependenciesTo is not None:
+                    dependee.dependenciesTo.append(dlink)
+                else:
+                    dependee.dependenciesTo = [dlink]
+                dlink.begin = dependee
+                if depender is not None and not isinstance(depender, Actor):
                     depender.dependencyFrom = dlink
                     dlink.end = depender
                     depender.properties['NodeType'] = 'depender'
                 else:
                     raise AttributeError("Begin or end must be an element of an Actor")
+
+        if not result:
+            raise AttributeError("Dependency not found")
+    elif depender is not None:
+        if not isinstance(depender, Actor):
+            model = depender.parent.parent
+            for dlink in model.dependencies.get(dependuum, []):
+                result = True
+                depender.dependencyFrom = dlink
+                dlink.end = depender
+                depender.properties['NodeType'] = 'depender'
         else:
             raise AttributeError("Begin or end must be an element of an Actor")
         if not result:
@@ -1739,15 +2025,17 @@ class DependencyLink(Link):
     def __init__(self, dependee, depender, dependuum):
         if depender.dependencyFrom is None or isinstance(depender, Actor):
             Link.__init__(self, dependee, depender)
+            self.dependuum = dependuum
             if isinstance(dependee, Actor):
-                dependee.parent.links.append(self)
+                model = dependee.parent
             else:
-                dependee.parent.parent.links.append(self)
+                model = dependee.parent.parent
                 dependee.dependenciesTo.append(self)
+            model.links.append(self)
+            model.indexDependency(self)
             if not isinstance(depender, Actor):
                 depender.dependencyFrom = self
                 depender.properties['NodeType'] = 'depender'
-            self.dependuum = dependuum
         else:
             raise AttributeError("Only One Dependency From a Node!")
 
@@ -1770,6 +2058,1204 @@ class DependencyLink(Link):
         pass
 
 
+class LabelPropagator(object):
+    """ Propagates labels through the intentions of goal models in topological order (worklist algorithm). Each
+    intention reachable from the start nodes is evaluated once, after all intentions contributing to it, from the
+    labels of these intentions, instead of once per path from a start node, which is exponential for shared
+    subgraphs.
+
+    :var dependencies: dependuum -> dependency links (see GoalModel.dependencyLinks) for re-propagating changed
+        labels of an evaluated model (see update), None for a propagation round of forwardEvaluation
+    :var actors: the actors of the model in the order forwardEvaluation evaluates them, if dependencies is set
+    :var fixpoint: if True, cycles of links are allowed: the intentions of each cycle (strongly connected
+        component) are evaluated repeatedly until their labels do not change anymore, at most maxIterations times
+    :var diverging: the cycles, whose labels did not converge in the last propagation, each a list of intentions
+    """
+    maxIterations = 100
+
+    def __init__(self, dependencies=None, fixpoint=False, maxIterations=None, actors=None):
+        self.dependencies = dependencies
+        self.actors = actors
+        self.fixpoint = fixpoint
+        if maxIterations is not None:
+            self.maxIterations = maxIterations
+        self.diverging = []
+        self.region = set()
+        self.stable = {}
+
+    def successors(self, intention):
+        for link in intention.contributionTo:
+            yield link.end
+        for link in intention.decompositionTo:
+            yield link.end
+        if self.dependencies is not None:
+            for n in self.dependents(intention):
+                yield n
+
+    def dependents(self, intention):
+        """ Yields the dependuums the intention sets the label of, and the dependers of a dependuum. """
+        for link in intention.dependenciesTo:
+            yield link.dependuum
+        for link in self.dependencies.get(intention, []):
+            if isinstance(link.end, Intention) and link.end.dependencyFrom is link:
+                yield link.end
+
+    def components(self, intentions, successors=None):
+        """ Returns the strongly connected components of the intentions (Tarjan's algorithm), successors first.
+
+        :param intentions: intentions closed under successors
+        :param successors: function returning the successors of an intention, default: successors
+        :return: list of components, each a list of intentions
+        """
+        if successors is None:
+            successors = self.successors
+        index = {}
+        lowlink = {}
+        stack = []
+        onStack = set()
+        components = []
+        for root in intentions:
+            if root in index:
+                continue
+            work = [(root, iter(list(successors(root))))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            onStack.add(root)
+            while work:
+                intention, remaining = work[-1]
+                for n in remaining:
+                    if n not in index:
+                        index[n] = lowlink[n] = len(index)
+                        stack.append(n)
+                        onStack.add(n)
+                        work.append((n, iter(list(successors(n)))))
+                        break
+                    elif n in onStack:
+                        lowlink[intention] = min(lowlink[intention], index[n])
+                else:
+                    work.pop()
+                    if work:
+                        lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[intention])
+                    if lowlink[intention] == index[intention]:
+                        component = []
+                        while True:
+                            n = stack.pop()
+                            onStack.discard(n)
+                            component.append(n)
+                            if n is intention:
+                                break
+                        components.append(component)
+        return components
+
+    def incoming(self, intention, active, contributions):
+        """ Returns the labels the intention receives.
+
+        :param intention:
+        :param active: set of intentions evaluated in the current round
+        :param contributions: contribution link -> contributed label
+        :return: list of (source name, label)
+        """
+        inputs = []
+        for link in intention.contributionFrom:
+            if link in contributions:
+                inputs.append((link.begin.name, contributions[link]))
+        for link in intention.decompositionFrom:
+            if link.begin in active:
+                inputs.append((link.begin.name, link.begin.properties.get('Label', 'None')))
+        return inputs
+
+    def reachable(self, startNodes):
+        """ Returns the intentions reachable from the start nodes, in the order they are found. """
+        found = []
+        seen = set()
+        stack = list(reversed(startNodes))
+        while stack:
+            intention = stack.pop()
+            if intention in seen:
+                continue
+            seen.add(intention)
+            found.append(intention)
+            stack.extend(reversed([n for n in self.successors(intention) if n not in seen]))
+        return found
+
+    def levels(self, intentions):
+        """ Sorts the intentions topologically into levels, i.e., each intention is in a later level than all
+        intentions contributing to it. The intentions of a level are independent of each other.
+
+        Actors depending on each other form cycles of dependency links. The dependency links within such a cycle
+        are not ordered, the depender receives the label the dependuum has when the depender is evaluated, as in
+        the rounds of forwardEvaluation (see lagging).
+
+        :param intentions: intentions closed under successors
+        :return: list of levels, each a list of intentions
+        :raise AttributeError: the intentions contain a cycle of contribution or decomposition links
+        """
+        lagging = self.lagging(intentions)
+        successors = {}
+        pending = dict.fromkeys(intentions, 0)
+        for intention in intentions:
+            successors[intention] = [n for n in OrderedDict.fromkeys(self.successors(intention))
+                                     if (intention, n) not in lagging]
+            for n in successors[intention]:
+                pending[n] += 1
+        level = [n for n in intentions if pending[n] == 0]
+        levels = []
+        count = 0
+        while level:
+            levels.append(level)
+            count += len(level)
+            nextLevel = []
+            for intention in level:
+                for n in successors[intention]:
+                    pending[n] -= 1
+                    if pending[n] == 0:
+                        nextLevel.append(n)
+            level = nextLevel
+        if count < len(intentions):
+            # the intentions left are the cycles and the intentions after them
+            position = {n: k for k, n in enumerate(intentions)}
+            cycles = [sorted(c, key=position.get)
+                      for c in self.components([n for n in intentions if pending[n] > 0], successors.__getitem__)
+                      if len(c) > 1 or c[0] in successors[c[0]]]
+            cycles.sort(key=lambda c: position[c[0]])
+            raise AttributeError("Cyclic goal model, labels cannot be propagated through the cycles: " +
+                                 '; '.join(', '.join(n.name for n in c) for c in cycles) +
+                                 " (see forwardEvaluation with fixpoint=True)")
+        return levels
+
+    def componentLevels(self, intentions):
+        """ Sorts the strongly connected components of the intentions topologically into levels, as levels sorts
+        the intentions.
+
+        :param intentions: intentions closed under successors
+        :return: list of levels, each a list of components, each a list of intentions in the order of intentions
+        """
+        position = {n: k for k, n in enumerate(intentions)}
+        components = [sorted(c, key=position.get) for c in self.components(intentions)]
+        components.sort(key=lambda c: position[c[0]])
+        component = {}
+        for k, c in enumerate(components):
+            for n in c:
+                component[n] = k
+        successors = []
+        pending = [0] * len(components)
+        for k, c in enumerate(components):
+            successors.append([m for m in OrderedDict.fromkeys(component[n] for intention in c
+                                                               for n in self.successors(intention)) if m != k])
+            for m in successors[k]:
+                pending[m] += 1
+        level = [k for k in range(len(components)) if pending[k] == 0]
+        levels = []
+        while level:
+            levels.append([components[k] for k in level])
+            nextLevel = []
+            for k in level:
+                for m in successors[k]:
+                    pending[m] -= 1
+                    if pending[m] == 0:
+                        nextLevel.append(m)
+            level = nextLevel
+        return levels
+
+    def isCycle(self, component):
+        return len(component) > 1 or component[0] in self.successors(component[0])
+
+    def lagging(self, intentions):
+        """ Returns the dependency links within cycles as set of (intention, dependent intention), see levels. """
+        lagging = set()
+        if self.dependencies is not None:
+            component = {}
+            for k, c in enumerate(self.components(intentions)):
+                for n in c:
+                    component[n] = k
+            for intention in intentions:
+                for n in self.dependents(intention):
+                    if component[n] == component[intention]:
+                        lagging.add((intention, n))
+        return lagging
+
+    def propagate(self, startNodes, inputs=None):
+        """ Propagates the labels from the start nodes.
+
+        :param startNodes: intentions, from which the labels are propagated
+        :param inputs: labels the start nodes receive from outside, intention -> (source name, label)
+        :return: the intentions whose label changed, intention -> previous label
+        :raise AttributeError: the intentions reachable from the start nodes contain a cycle (unless fixpoint)
+        """
+        if self.dependencies is not None:
+            return self.update(startNodes)
+        if inputs is None:
+            inputs = {}
+        intentions = self.reachable(startNodes)
+        active = set(intentions)
+        labels = OrderedDict((n, n.properties.get('Label')) for n in intentions)
+        self.diverging = []
+        if self.fixpoint:
+            for level in self.componentLevels(intentions):
+                self.evaluateLevel([c[0] for c in level if not self.isCycle(c)], active, inputs, labels)
+                for component in level:
+                    if self.isCycle(component):
+                        self.iterate(component, active, inputs, labels)
+        else:
+            for level in self.levels(intentions):
+                self.evaluateLevel(level, active, inputs, labels)
+        return OrderedDict((n, label) for n, label in labels.items() if n.properties.get('Label') != label)
+
+    def evaluateLevel(self, level, active, inputs, labels):
+        """ Evaluates intentions independent of each other.
+
+        :param level: list of intentions
+        :param active: set of intentions evaluated in the current round
+        :param inputs: labels the start nodes receive from outside, intention -> (source name, label)
+        :param labels: intention -> previous label, the dependuums labeled are added
+        """
+        links = [link for intention in level for link in intention.contributionFrom if link.begin in active]
+        contributions = dict(zip(links, ContributionLink.computeLabels(links)))
+        for intention in level:
+            received = self.incoming(intention, active, contributions)
+            if intention in inputs:
+                received.insert(0, inputs[intention])
+            intention.evaluate(received)
+            if 'Label' in intention.properties:
+                for link in intention.dependenciesTo:
+                    labels.setdefault(link.dependuum, link.dependuum.properties.get('Label'))
+                    link.dependuum.properties['Label'] = intention.properties['Label']
+
+    def update(self, startNodes):
+        """ Re-propagates the labels of an evaluated model from the intentions whose label changed. The region of
+        intentions downstream of them (along contribution, decomposition and dependency links) is evaluated in
+        rounds of forwardEvaluation: in each round, the actors are evaluated one after the other, each as
+        Actor.forwardEvaluation evaluates it, but only its intentions in the region. The rounds are repeated until
+        the labels do not change anymore, at most maxIterations times. The intentions outside the region are not
+        affected by the changes, so the labels are the same as if forwardEvaluation were repeated until the labels
+        do not change anymore.
+
+        :param startNodes: intentions whose label changed
+        :return: the intentions whose label changed, intention -> previous label
+        :raise AttributeError: the region contains a cycle of contribution or decomposition links
+        """
+        startNodes = list(startNodes)
+        for n in list(startNodes):
+            for link in self.dependencies.get(n, []):
+                if isinstance(link.begin, Intention):
+                    startNodes.append(link.begin)  # the dependee overwrites the label of a changed dependuum
+        intentions = self.reachable(startNodes)
+        self.region = set(intentions)
+        self.stable = {}
+        self.diverging = []
+        labels = OrderedDict((n, n.properties.get('Label')) for n in intentions)
+        position = {actor: k for k, actor in enumerate(self.actors)}
+        rounds = [[] for actor in self.actors]  # the levels of the intentions of each actor in the region
+        for level in self.levels(intentions):
+            members = OrderedDict()
+            for n in level:
+                if n.parent in position:
+                    members.setdefault(position[n.parent], []).append(n)
+            for k, actorLevel in members.items():
+                rounds[k].append(actorLevel)
+        for iteration in range(self.maxIterations):
+            previous = [n.properties.get('Label') for n in intentions]
+            for levels in rounds:
+                if levels:
+                    self.evaluateActor(levels, labels)
+            if [n.properties.get('Label') for n in intentions] == previous:
+                break
+        else:
+            self.diverging.append(intentions)
+        return OrderedDict((n, label) for n, label in labels.items() if n.properties.get('Label') != label)
+
+    def evaluateActor(self, levels, labels):
+        """ Evaluates the intentions of an actor in the region as Actor.forwardEvaluation does: the leaves and
+        dependers get their input label, the dependers receive the label of their dependency, and the intentions
+        reached from the leaves and the labeled dependers are evaluated. A depender waiting for its dependency
+        keeps its input label.
+
+        :param levels: the intentions of the actor in the region, sorted topologically into levels
+        :param labels: intention -> previous label, the dependuums labeled are added
+        """
+        inputs = {}
+        waiting = []
+        for level in levels:
+            for n in level:
+                n.properties.pop('humanJudgment', None)
+                if n.properties.get('NodeType') in ('leaf', 'depender') and 'InputLabel' in n.properties:
+                    n.properties['Label'] = n.properties['InputLabel']
+        for level in levels:
+            for n in level:
+                if n.properties.get('NodeType') == 'depender':
+                    label = n.dependencyLabel()
+                    if label is not None:
+                        inputs[n] = label
+                    else:
+                        waiting.append(n)
+        active = set()
+        for level in levels:
+            evaluated = []
+            for n in level:
+                sources = [link.begin for link in n.contributionFrom] + [link.begin for link in n.decompositionFrom]
+                for source in sources:
+                    if source not in self.region and self.wasActive(source):
+                        active.add(source)
+                if n.properties.get('NodeType') == 'leaf' or n in inputs or any(s in active for s in sources):
+                    active.add(n)
+                    evaluated.append(n)
+            self.evaluateLevel(evaluated, active, inputs, labels)
+        for n in waiting:
+            if 'InputLabel' in n.properties:
+                n.properties['Label'] = n.properties['InputLabel']
+
+    def wasActive(self, intention):
+        """ Returns True if forwardEvaluation evaluates an intention outside the region, i.e., if it is a leaf or a
+        depender with a labeled dependency, or reached from one by contribution and decomposition links. These
+        intentions do not change, their activity is cached in stable.
+        """
+        stack = [(intention, False)]
+        expanding = set()
+        while stack:
+            n, expanded = stack.pop()
+            if n in self.stable:
+                continue
+            sources = [link.begin for link in n.contributionFrom] + [link.begin for link in n.decompositionFrom]
+            nodeType = n.properties.get('NodeType')
+            if expanded:
+                self.stable[n] = any(self.stable.get(source, False) for source in sources)
+            elif isinstance(n.parent, Actor) and \
+                    (nodeType == 'leaf' or nodeType == 'depender' and n.dependencyLabel() is not None):
+                self.stable[n] = True
+            elif n not in expanding:
+                expanding.add(n)
+                stack.append((n, True))
+                stack.extend((source, False) for source in sources)
+        return self.stable[intention]
+
+    def iterate(self, component, active, inputs, labels):
+        """ Evaluates the intentions of a cycle one after the other until their labels do not change anymore, at
+        most maxIterations times. A cycle, which does not converge, is appended to diverging. Only the last
+        evaluation may ask for a human judgment.
+        """
+        for iteration in range(self.maxIterations):
+            previous = [n.properties.get('Label') for n in component]
+            for intention in component:
+                intention.properties.pop('humanJudgment', None)
+                self.evaluateLevel([intention], active, inputs, labels)
+            if [n.properties.get('Label') for n in component] == previous:
+                return
+        self.diverging.append(component)
+
+
+class FrozenGoalModel(object):
+    """ A goal model (with its actors) frozen into compact arrays for analyzing large models. The intentions are
+    numbered in the order of GoalModel.collectIntentions, the links are edges in compressed sparse row format:
+    the edges leaving intention k are outEdges[outOffsets[k]:outOffsets[k + 1]], the edges entering it are
+    inEdges[inOffsets[k]:inOffsets[k + 1]] (in the order the labels are received, see LabelPropagator.incoming).
+
+    :var names: names of the intentions
+    :var kinds: kind of each intention, index in kindNames
+    :var actors: actor of each intention, index in actorNames, -1 if the intention is not part of an actor
+    :var labels: code of the label of each intention (see ContributionLink.labelTable), 0 for none
+    :var inputLabels: code of the input label of each intention (see SetLabel)
+    :var judgments: code of the human judgment of each softgoal (see MakeJudgement)
+    :var dependers: 1 for the dependers, i.e., intentions with a dependency
+    :var sources: source intention of each edge
+    :var targets: target intention of each edge
+    :var types: type of each edge, index in edgeTypeNames: a contribution link, a decomposition or means-end link,
+        a dependency (from the dependee to the dependuum it labels), the dependuum of a depender, and the dependee
+        of a depender
+    :var contributions: type code of the contribution links (index in ContributionLink.types), else -1
+    """
+    kindNames = ['Goal', 'SoftGoal', 'Task', 'Resource', 'Intention']
+    edgeTypeNames = ['contribution', 'decomposition', 'dependency', 'dependuum', 'dependee']
+    CONTRIBUTION, DECOMPOSITION, DEPENDENCY, DEPENDUUM, DEPENDEE = range(5)
+
+    def __init__(self, model):
+        intentions = model.collectIntentions([])
+        index = {n: k for k, n in enumerate(intentions)}
+        self.names = [n.name for n in intentions]
+        self.actorNames = []
+        actorIndex = {}
+        self.kinds = array('b')
+        self.actors = array('i')
+        self.labels = array('b')
+        self.inputLabels = array('b')
+        self.judgments = array('b')
+        self.dependers = array('b')
+        self.sources = array('i')
+        self.targets = array('i')
+        self.types = array('b')
+        self.contributions = array('b')
+        edges = {}  # link -> edge
+        for k, n in enumerate(intentions):
+            kind = type(n).__name__
+            self.kinds.append(self.kindNames.index(kind) if kind in self.kindNames else len(self.kindNames) - 1)
+            if isinstance(n.parent, Actor):
+                if n.parent not in actorIndex:
+                    actorIndex[n.parent] = len(self.actorNames)
+                    self.actorNames.append(n.parent.name)
+                self.actors.append(actorIndex[n.parent])
+            else:
+                self.actors.append(-1)
+            self.labels.append(GoalModel.Label.get(n.properties.get('Label'), 0))
+            self.inputLabels.append(GoalModel.Label.get(n.properties.get('InputLabel'), 0))
+            self.judgments.append(GoalModel.Label.get(n.properties.get('Judgment'), 0)
+                                  if isinstance(n, SoftGoal) else 0)
+            self.dependers.append(1 if n.dependencyFrom is not None else 0)
+            dependency = n.dependencyFrom
+            if dependency is not None and n.properties.get('NodeType') == 'depender':
+                if dependency.dependuum in index:
+                    edges[dependency] = self.addEdge(index[dependency.dependuum], k, self.DEPENDUUM)
+                if dependency.begin in index:
+                    edges[dependency.begin, n] = self.addEdge(index[dependency.begin], k, self.DEPENDEE)
+            for link in n.contributionFrom:
+                if link.begin in index:
+                    edges[link] = self.addEdge(index[link.begin], k, self.CONTRIBUTION,
+                                               ContributionLink.typeCodes[link.type])
+            for link in n.decompositionFrom:
+                if link.begin in index:
+                    edges[link] = self.addEdge(index[link.begin], k, self.DECOMPOSITION)
+        for k, n in enumerate(intentions):
+            for link in n.dependenciesTo:
+                if link.dependuum in index:
+                    edges[n, link] = self.addEdge(k, index[link.dependuum], self.DEPENDENCY)
+        # incoming edges in the order the labels are received
+        self.inOffsets = array('i', [0] * (len(self.names) + 1))
+        for k in self.targets:
+            self.inOffsets[k + 1] += 1
+        for k in range(len(self.names)):
+            self.inOffsets[k + 1] += self.inOffsets[k]
+        position = array('i', self.inOffsets)
+        self.inEdges = array('i', [0] * len(self.targets))
+        for e, k in enumerate(self.targets):
+            self.inEdges[position[k]] = e
+            position[k] += 1
+        # outgoing edges in the order of LabelPropagator.successors, the dependee edges last
+        dependencies = model.dependencyLinks()
+        self.outOffsets = array('i', [0])
+        self.outEdges = array('i')
+        for k, n in enumerate(intentions):
+            links = n.contributionTo + n.decompositionTo + [(n, link) for link in n.dependenciesTo] + \
+                dependencies.get(n, []) + [(n, link.end) for link in n.dependenciesTo]
+            self.outEdges.extend(edges[link] for link in links if link in edges)
+            self.outOffsets.append(len(self.outEdges))
+
+    def addEdge(self, source, target, edgeType, contribution=-1):
+        self.sources.append(source)
+        self.targets.append(target)
+        self.types.append(edgeType)
+        self.contributions.append(contribution)
+        return len(self.types) - 1
+
+    def outgoing(self, k):
+        """ Returns the edges leaving intention k. """
+        return self.outEdges[self.outOffsets[k]:self.outOffsets[k + 1]]
+
+    def incoming(self, k):
+        """ Returns the edges entering intention k. """
+        return self.inEdges[self.inOffsets[k]:self.inOffsets[k + 1]]
+
+    def components(self):
+        """ Returns the strongly connected component of each intention (Tarjan's algorithm) along all but the
+        dependee edges. The components are numbered in reverse topological order, i.e., an edge between components
+        leads to a lower number.
+        """
+        model = self
+        count = len(model.names)
+        index = array('i', [-1] * count)
+        lowlink = array('i', [0] * count)
+        component = array('i', [-1] * count)
+        onStack = array('b', [0] * count)
+        stack = []
+        counter = 0
+        components = 0
+        for root in range(count):
+            if index[root] >= 0:
+                continue
+            work = [(root, model.outOffsets[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            onStack[root] = 1
+            while work:
+                k, position = work[-1]
+                if position < model.outOffsets[k + 1]:
+                    work[-1] = (k, position + 1)
+                    e = model.outEdges[position]
+                    if model.types[e] == model.DEPENDEE:
+                        continue
+                    n = model.targets[e]
+                    if index[n] < 0:
+                        index[n] = lowlink[n] = counter
+                        counter += 1
+                        stack.append(n)
+                        onStack[n] = 1
+                        work.append((n, model.outOffsets[n]))
+                    elif onStack[n]:
+                        lowlink[k] = min(lowlink[k], index[n])
+                else:
+                    work.pop()
+                    if work:
+                        lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[k])
+                    if lowlink[k] == index[k]:
+                        while True:
+                            n = stack.pop()
+                            onStack[n] = 0
+                            component[n] = components
+                            if n == k:
+                                break
+                        components += 1
+        return component
+
+    def reachability(self, targets=None, sources=None):
+        """ Computes which sources can influence the targets along contribution, decomposition and dependency links:
+        the rows of all intentions are computed in one sweep over the strongly connected components in topological
+        order (intentions of a cycle influence each other), a row is dropped as soon as the rows of all successors
+        are computed.
+
+        :param targets: intentions, the roots if None
+        :param sources: intentions, the leaves if None
+        :return: for each target, a bitset (int), in which bit i is set if sources[i] can influence the target
+        """
+        if targets is None:
+            targets = self.roots()
+        if sources is None:
+            sources = self.leaves()
+        component = self.components()
+        count = max(component) + 1 if len(component) else 0
+        bits = [0] * count
+        for i, k in enumerate(sources):
+            bits[component[k]] |= 1 << i
+        pending = array('i', [0] * count)  # successors of each component, whose rows are not yet computed
+        predecessors = [[] for c in range(count)]
+        for e, edgeType in enumerate(self.types):
+            source, target = component[self.sources[e]], component[self.targets[e]]
+            if edgeType != self.DEPENDEE and source != target:
+                predecessors[target].append(source)
+                pending[source] += 1
+        kept = array('b', [0] * count)
+        for k in targets:
+            kept[component[k]] = 1
+        rows = [0] * count
+        for c in range(count - 1, -1, -1):
+            row = bits[c]
+            for p in predecessors[c]:
+                row |= rows[p]
+                pending[p] -= 1
+                if pending[p] == 0 and not kept[p]:
+                    rows[p] = 0
+            rows[c] = row
+            predecessors[c] = None
+        return [rows[component[k]] for k in targets]
+
+    @staticmethod
+    def members(bitset):
+        """ Returns the indices of the bits set in bitset. """
+        bits = format(bitset, 'b')[::-1]
+        members = []
+        i = bits.find('1')
+        while i >= 0:
+            members.append(i)
+            i = bits.find('1', i + 1)
+        return members
+
+    def leaves(self):
+        """ Returns the leaf intentions, see Actor.findLeaf. """
+        linked = array('b', self.dependers)
+        for e, edgeType in enumerate(self.types):
+            if edgeType <= self.DECOMPOSITION:
+                linked[self.targets[e]] = 1
+        return [k for k, actor in enumerate(self.actors) if actor >= 0 and not linked[k]]
+
+    def roots(self):
+        """ Returns the root intentions, see Actor.findRoot. """
+        linked = array('b', self.dependers)
+        for e, edgeType in enumerate(self.types):
+            if edgeType <= self.DEPENDENCY:
+                linked[self.sources[e]] = 1
+        return [k for k, actor in enumerate(self.actors) if actor >= 0 and not linked[k]]
+
+    def evaluate(self, jobs=1):
+        """ Propagates the input labels and human judgments of the model, see LabelNetwork.
+
+        :param jobs: number of processes evaluating independent actors, see LabelNetwork.evaluateParallel
+        :return: code of the resulting label of each intention
+        """
+        if jobs > 1:
+            return LabelNetwork(self).evaluateParallel(list(self.inputLabels), jobs)
+        return LabelNetwork(self).evaluate(list(self.inputLabels))
+
+
+class LabelNetwork(object):
+    """ Evaluates label assignments (scenarios) on a FrozenGoalModel, i.e., without changing the goal model. Labels
+    are coded as in ContributionLink.labelTable. The network consists of arrays only, hence it can be sent to other
+    processes.
+
+    A scenario is evaluated like a copy of the model, which was not evaluated yet, with the input labels of the
+    scenario (see SetLabel) and the human judgments made in the model (see MakeJudgement), by forwardEvaluation
+    until the labels do not change anymore: in each round, the actors are evaluated one after the other as in
+    Actor.forwardEvaluation (see evaluateActor), and the labels received in earlier rounds are kept as in
+    Intention.incomingLabels.
+
+    :var model: the FrozenGoalModel
+    :var groups: for each edge entering an intention (in the order of model.inEdges), the index of its source
+        name among the source names of the intention; labels from sources of the same name replace each other,
+        as in Intention.receiveLabels
+    :var groupCounts: number of source names of each intention
+    :var order: intentions in topological order, see LabelPropagator.levels
+    :var starts: LEAF for the leaves and DEPENDER for the dependers of the actors, i.e., the start nodes of
+        Actor.forwardEvaluation, else 0
+    :var actorOffsets: the intentions evaluated with actor a, i.e., its intentions and those reached from them by
+        contribution and decomposition links, are actorIntentions[actorOffsets[a]:actorOffsets[a + 1]], in
+        topological order
+    :var actorIntentions: see actorOffsets
+    :var repeated: True if a single round does not suffice, i.e., if an actor depends on itself or on a later actor,
+        or an intention is evaluated with several actors; the rounds are then repeated until the labels do not
+        change, at most maxRounds times
+    """
+    maxRounds = 100
+    LEAF, DEPENDER = 1, 2
+
+    def __init__(self, model):
+        self.model = model
+        self.groups = array('i')
+        self.groupCounts = array('i')
+        for k in range(len(model.names)):
+            names = {}
+            for e in model.incoming(k):
+                if model.types[e] != model.DEPENDENCY:
+                    names.setdefault(model.names[model.sources[e]], len(names))
+                self.groups.append(names.get(model.names[model.sources[e]], -1))
+            self.groupCounts.append(len(names))
+        self.order = self.sort()
+        self.starts = array('b', [0] * len(model.names))
+        for k in model.leaves():
+            self.starts[k] = self.LEAF
+        for k, depender in enumerate(model.dependers):
+            if depender and model.actors[k] >= 0:
+                self.starts[k] = self.DEPENDER
+        position = array('i', [0] * len(model.names))
+        for i, k in enumerate(self.order):
+            position[k] = i
+        members = [[] for a in model.actorNames]
+        for k, actor in enumerate(model.actors):
+            if actor >= 0:
+                members[actor].append(k)
+        self.actorOffsets = array('i', [0])
+        self.actorIntentions = array('i')
+        for intentions in members:
+            found = set(intentions)
+            stack = list(intentions)
+            while stack:
+                for e in model.outgoing(stack.pop()):
+                    n = model.targets[e]
+                    if model.types[e] <= model.DECOMPOSITION and n not in found:
+                        found.add(n)
+                        stack.append(n)
+            self.actorIntentions.extend(sorted(found, key=position.__getitem__))
+            self.actorOffsets.append(len(self.actorIntentions))
+        writers = self.writers()
+        self.repeated = any(len(actors) > 1 for actors in writers) or \
+            any(writer >= actor for actor in range(len(members))
+                for k in self.dependencies(actor) for writer in writers[k])
+
+    def sort(self):
+        """ Sorts the intentions topologically, in the order of LabelPropagator.levels. Dependency edges within
+        cycles do not order the evaluation.
+
+        :return: the intentions in topological order
+        :raise AttributeError: the model contains a cycle of contribution or decomposition links
+        """
+        model = self.model
+        count = len(model.names)
+        component = model.components()
+        # successors without duplicates, the dependency edges within cycles and the dependee edges
+        offsets = array('i', [0])
+        successors = array('i')
+        pending = array('i', [0] * count)
+        stamp = array('i', [-1] * count)
+        for k in range(count):
+            for e in model.outgoing(k):
+                n = model.targets[e]
+                if model.types[e] == model.DEPENDEE or stamp[n] == k:
+                    continue
+                stamp[n] = k
+                if model.types[e] >= model.DEPENDENCY and component[k] == component[n]:
+                    continue
+                successors.append(n)
+                pending[n] += 1
+            offsets.append(len(successors))
+        # intentions in the order they are found from the first one, see LabelPropagator.reachable
+        found = array('i')
+        seen = array('b', [0] * count)
+        for root in range(count):
+            stack = [root]
+            while stack:
+                k = stack.pop()
+                if seen[k]:
+                    continue
+                seen[k] = 1
+                found.append(k)
+                stack.extend(reversed([model.targets[e] for e in model.outgoing(k)
+                                       if model.types[e] != model.DEPENDEE and not seen[model.targets[e]]]))
+        level = [k for k in found if pending[k] == 0]
+        order = array('i')
+        while level:
+            order.extend(level)
+            nextLevel = []
+            for k in level:
+                for n in successors[offsets[k]:offsets[k + 1]]:
+                    pending[n] -= 1
+                    if pending[n] == 0:
+                        nextLevel.append(n)
+            level = nextLevel
+        if len(order) < count:
+            raise AttributeError("Cyclic goal model, labels cannot be propagated through: " +
+                                 ', '.join(model.names[k] for k in found if pending[k] > 0))
+        return order
+
+    def written(self, actor):
+        """ Returns the intentions, whose label the evaluation of actor may set: the intentions it is evaluated with
+        (see actorOffsets) and their dependuums. """
+        model = self.model
+        written = []
+        for k in self.actorIntentions[self.actorOffsets[actor]:self.actorOffsets[actor + 1]]:
+            written.append(k)
+            written.extend(model.targets[e] for e in model.outgoing(k) if model.types[e] == model.DEPENDENCY)
+        return list(OrderedDict.fromkeys(written))
+
+    def writers(self):
+        """ Returns for each intention the actors, whose evaluation may set its label, see written. """
+        writers = [[] for k in self.model.names]
+        for actor in range(len(self.actorOffsets) - 1):
+            for k in self.written(actor):
+                writers[k].append(actor)
+        return writers
+
+    def dependencies(self, actor):
+        """ Returns the intentions, whose label the dependers of actor read, see dependency. """
+        model = self.model
+        found = []
+        for k in self.actorIntentions[self.actorOffsets[actor]:self.actorOffsets[actor + 1]]:
+            if self.starts[k] == self.DEPENDER and model.actors[k] == actor:
+                found.extend(model.sources[e] for e in model.incoming(k)
+                             if model.types[e] in (model.DEPENDUUM, model.DEPENDEE))
+        return list(OrderedDict.fromkeys(found))
+
+    def dependency(self, k, result):
+        """ Returns the position of the edge (in model.inEdges), by which depender k receives the label of its
+        dependency: the edge from the dependuum if it is labeled, else from the dependee, see
+        Intention.dependencyLabel. -1 if neither is labeled.
+        """
+        model = self.model
+        found = -1
+        for position in range(model.inOffsets[k], model.inOffsets[k + 1]):
+            e = model.inEdges[position]
+            if model.types[e] == model.DEPENDUUM and result[model.sources[e]]:
+                return position
+            elif model.types[e] == model.DEPENDEE and result[model.sources[e]]:
+                found = position
+        return found
+
+    def evaluate(self, labels):
+        """ Evaluates a scenario.
+
+        :param labels: list of the input label code of each intention, 0 for none
+        :return: list of the resulting label code of each intention
+        """
+        result = list(labels)
+        for k, judgment in enumerate(self.model.judgments):
+            if judgment:
+                result[k] = judgment
+        received = [[0] * count for count in self.groupCounts]
+        for rounds in range(self.maxRounds if self.repeated else 1):
+            previous = list(result)
+            self.evaluateRound(labels, result, received)
+            if result == previous:
+                break
+        return result
+
+    def actorComponents(self):
+        """ Sorts the actors into components, which are evaluated independently of each other: actors setting the
+        label of the same intention (see writers) belong to the same component, and so do actors depending on each
+        other in cycles. The components are sorted topologically into levels along the dependency links, i.e., the
+        dependers of a component only read labels set by components of earlier levels. Hence the components of a
+        level set disjoint intentions.
+
+        :return: list of levels, each a list of components, each a list of actors
+        """
+        count = len(self.actorOffsets) - 1
+        unit = list(range(count))  # representative of the actors setting the label of the same intention
+
+        def find(actor):
+            while unit[actor] != actor:
+                unit[actor] = unit[unit[actor]]
+                actor = unit[actor]
+            return actor
+        writers = self.writers()
+        for actors in writers:
+            for actor in actors[1:]:
+                unit[find(actor)] = find(actors[0])
+        successors = [[] for u in range(count)]
+        for actor in range(count):
+            for k in self.dependencies(actor):
+                for writer in writers[k]:
+                    if find(writer) != find(actor):
+                        successors[find(writer)].append(find(actor))
+        # strongly connected components of the units (Tarjan's algorithm)
+        index = array('i', [-1] * count)
+        lowlink = array('i', [0] * count)
+        component = array('i', [-1] * count)
+        stack = []
+        counter = 0
+        components = 0
+        for root in range(count):
+            if index[root] >= 0:
+                continue
+            work = [(root, 0)]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            while work:
+                u, position = work[-1]
+                if position < len(successors[u]):
+                    work[-1] = (u, position + 1)
+                    v = successors[u][position]
+                    if index[v] < 0:
+                        index[v] = lowlink[v] = counter
+                        counter += 1
+                        stack.append(v)
+                        work.append((v, 0))
+                    elif component[v] < 0:
+                        lowlink[u] = min(lowlink[u], index[v])
+                else:
+                    work.pop()
+                    if work:
+                        lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[u])
+                    if lowlink[u] == index[u]:
+                        while True:
+                            v = stack.pop()
+                            component[v] = components
+                            if v == u:
+                                break
+                        components += 1
+        # levels of the components
+        members = [[] for c in range(components)]
+        for actor in range(count):
+            members[component[find(actor)]].append(actor)
+        pending = [0] * components
+        dependents = [set() for c in range(components)]
+        for u in range(count):
+            for v in successors[u]:
+                if component[u] != component[v] and component[v] not in dependents[component[u]]:
+                    dependents[component[u]].add(component[v])
+                    pending[component[v]] += 1
+        level = [c for c in range(components) if pending[c] == 0]
+        levels = []
+        while level:
+            levels.append([members[c] for c in level if members[c]])
+            nextLevel = []
+            for c in level:
+                for d in sorted(dependents[c]):
+                    pending[d] -= 1
+                    if pending[d] == 0:
+                        nextLevel.append(d)
+            level = nextLevel
+        return levels
+
+    def evaluateParallel(self, labels, jobs=1):
+        """ Evaluates a scenario like evaluate, but component by component (see actorComponents). The components of
+        a level are evaluated concurrently by jobs processes. A component gets only the labels it reads: those of the
+        intentions its actors set, and the history of the labels its dependers read, as set by earlier components in
+        each round and actor (see evaluateComponent). Hence its actors read the same labels as in evaluate. The
+        results are merged in the order of the components.
+
+        :param labels: list of the input label code of each intention, 0 for none
+        :param jobs: number of processes
+        :return: list of the resulting label code of each intention
+        """
+        result = list(labels)
+        for k, judgment in enumerate(self.model.judgments):
+            if judgment:
+                result[k] = judgment
+        history = {}  # intention -> list of (time, label code), see evaluateComponent
+        levels = self.actorComponents()
+        executor = None
+        if jobs > 1 and any(len(level) > 1 for level in levels):
+            executor = ProcessPoolExecutor(max_workers=jobs)
+        try:
+            for level in levels:
+                tasks = []
+                for actors in level:
+                    written = OrderedDict.fromkeys(k for actor in actors for k in self.written(actor))
+                    read = [k for actor in actors for k in self.dependencies(actor) if k not in written]
+                    tasks.append((actors, {k: labels[k] for k in written},
+                                  {k: result[k] for k in list(written) + read},
+                                  {k: history[k] for k in read if k in history}))
+                if executor is not None and len(level) > 1:
+                    outputs = executor.map(self.evaluateComponent, *zip(*tasks),
+                                           chunksize=(len(tasks) + jobs - 1) // jobs)
+                else:
+                    outputs = [self.evaluateComponent(*task) for task in tasks]
+                for labeled, changes in outputs:
+                    for k, label in labeled.items():
+                        result[k] = label
+                    history.update(changes)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return result
+
+    def evaluateComponent(self, actors, labels, result, history):
+        """ Evaluates a component of actors (see actorComponents) in rounds as evaluate does. Before an actor is
+        evaluated, the intentions set by other components get the label they have at this time in evaluate: the last
+        one of their history before it. The time of actor a in round r is r * (number of actors) + a.
+
+        :param actors: the actors of the component
+        :param labels: intention -> input label code, for the intentions set by the actors
+        :param result: intention -> label code, for the intentions set by the actors and read by their dependers
+        :param history: intention -> list of (time, label code) of its labels, for the intentions read by the
+            dependers and set by other components
+        :return: (labeled, changes), where labeled maps the intentions set by the actors to their label codes, and
+            changes maps those among them read by dependers to the list of (time, label code) of their labels
+        """
+        model = self.model
+        count = len(self.actorOffsets) - 1
+        received = {k: [0] * self.groupCounts[k] for k in labels}
+        reads = {actor: [k for k in self.dependencies(actor) if k in history] for actor in actors}
+        changes = {k: [(-1, result[k])] for k in labels
+                   if any(model.types[e] in (model.DEPENDUUM, model.DEPENDEE) for e in model.outgoing(k))}
+        last = max(times[-1][0] for times in history.values()) // count if history else -1
+        for rounds in range(self.maxRounds if self.repeated else 1):
+            previous = [result[k] for k in labels]
+            for actor in actors:
+                time = rounds * count + actor
+                for k in reads[actor]:
+                    result[k] = history[k][bisect_left(history[k], (time,)) - 1][1]
+                self.evaluateActor(actor, labels, result, received)
+                for k, times in changes.items():
+                    if result[k] != times[-1][1]:
+                        times.append((time, result[k]))
+            if rounds > last and [result[k] for k in labels] == previous:
+                break
+        return {k: result[k] for k in labels}, changes
+
+    def evaluateRound(self, labels, result, received):
+        """ Evaluates the actors one after the other, as a round of forwardEvaluation.
+
+        :param labels: list of the input label code of each intention
+        :param result: list of the label code of each intention, updated
+        :param received: for each intention, the label code received from each source name (see groups), updated
+        """
+        for actor in range(len(self.actorOffsets) - 1):
+            self.evaluateActor(actor, labels, result, received)
+
+    def evaluateActor(self, actor, labels, result, received):
+        """ Evaluates an actor as Actor.forwardEvaluation does: its leaves and dependers get their input label, the
+        dependers receive the label of their dependency (if labeled), and the intentions reached from the leaves and
+        these dependers are evaluated in topological order, each from the labels of the evaluated intentions
+        contributing to it. A depender waiting for its dependency keeps its input label.
+
+        :param actor: index of the actor
+        :param labels: input label code of each intention, a list or a dict of the intentions the actor sets
+        :param result: label code of each intention, a list or a dict of the intentions the actor sets or reads,
+            updated
+        :param received: for each intention, the label code received from each source name (see groups), updated
+        """
+        model = self.model
+        table = ContributionLink.labelTable
+        intentions = self.actorIntentions[self.actorOffsets[actor]:self.actorOffsets[actor + 1]]
+        for k in intentions:
+            if self.starts[k] and model.actors[k] == actor and labels[k]:
+                result[k] = labels[k]
+        inputs = {}  # depender -> (position of the edge, label code) of its dependency
+        waiting = []
+        for k in intentions:
+            if self.starts[k] == self.DEPENDER and model.actors[k] == actor:
+                position = self.dependency(k, result)
+                if position >= 0:
+                    inputs[k] = (position, result[model.sources[model.inEdges[position]]])
+                else:
+                    waiting.append(k)
+        active = set()
+        for k in intentions:
+            edges = [position for position in range(model.inOffsets[k], model.inOffsets[k + 1])
+                     if model.types[model.inEdges[position]] <= model.DECOMPOSITION and
+                     model.sources[model.inEdges[position]] in active]
+            if not edges and k not in inputs and not (self.starts[k] == self.LEAF and model.actors[k] == actor):
+                continue
+            active.add(k)
+            values = received[k]
+            got = False
+            if k in inputs:
+                position, label = inputs[k]
+                values[self.groups[position]] = label
+                got = True
+            for position in edges:
+                e = model.inEdges[position]
+                label = result[model.sources[e]]
+                if model.types[e] == model.CONTRIBUTION:
+                    label = table[label][model.contributions[e]]
+                if label:
+                    values[self.groups[position]] = label
+                    got = True
+            kind = model.kinds[k]
+            if kind == 1 and model.judgments[k]:
+                result[k] = model.judgments[k]
+            elif got and kind <= 2:
+                codes = [value for value in values if value]
+                if kind == 0:
+                    result[k] = max(codes)
+                elif kind == 2:
+                    result[k] = min(codes)
+                else:
+                    result[k] = self.combine(codes, labels[k])
+            if result[k]:
+                for e in model.outgoing(k):
+                    if model.types[e] == model.DEPENDENCY:
+                        result[model.targets[e]] = result[k]
+        for k in waiting:
+            if labels[k]:
+                result[k] = labels[k]
+
+    @staticmethod
+    def combine(values, inputLabel):
+        """ The rules of SoftGoal.combineLabels on label codes. """
+        unknown = GoalModel.Label['Unknown']
+        if len(values) == 1:
+            label = values[0]
+        elif unknown in values or GoalModel.Label['Conflict'] in values:
+            label = unknown
+        elif GoalModel.Label['Satisfied'] in values and GoalModel.Label['Denied'] not in values and \
+                GoalModel.Label['Partially Denied'] not in values:
+            label = GoalModel.Label['Satisfied']
+        elif GoalModel.Label['Denied'] in values and GoalModel.Label['Satisfied'] not in values and \
+                GoalModel.Label['Partially Satisfied'] not in values:
+            label = GoalModel.Label['Denied']
+        else:
+            label = unknown
+        if inputLabel and inputLabel != label:
+            label = unknown
+        return label
+
+    def evaluateMatrix(self, labels):
+        """ Evaluates many scenarios at once with NumPy.
+
+        :param labels: array scenarios x intentions of input label codes
+        :return: array scenarios x intentions of resulting label codes
+        """
+        result = labels.copy()
+        judged = numpy.frombuffer(self.model.judgments, dtype=numpy.int8)
+        result[:, judged > 0] = judged[judged > 0]
+        received = {}
+        for rounds in range(self.maxRounds if self.repeated else 1):
+            previous = result.copy()
+            for actor in range(len(self.actorOffsets) - 1):
+                self.evaluateMatrixActor(actor, labels, result, received)
+            if (result == previous).all():
+                break
+        return result
+
+    def evaluateMatrixActor(self, actor, labels, result, received):
+        """ Evaluates an actor in all scenarios at once, as evaluateActor does.
+
+        :param actor: index of the actor
+        :param labels: array scenarios x intentions of input label codes
+        :param result: array scenarios x intentions of label codes, updated
+        :param received: intention -> array scenarios x source names of the label codes received, updated
+        """
+        model = self.model
+        code = GoalModel.Label
+        scenarios = len(labels)
+        intentions = self.actorIntentions[self.actorOffsets[actor]:self.actorOffsets[actor + 1]]
+        for k in intentions:
+            if self.starts[k] and model.actors[k] == actor:
+                result[:, k] = numpy.where(labels[:, k] > 0, labels[:, k], result[:, k])
+        inputs = {}  # depender -> list of (position of the edge, scenarios receiving by it, label codes)
+        waiting = {}  # depender -> scenarios, in which it waits for its dependency
+        for k in intentions:
+            if self.starts[k] == self.DEPENDER and model.actors[k] == actor:
+                opened = numpy.zeros(scenarios, dtype=bool)
+                inputs[k] = []
+                for edgeType in (model.DEPENDUUM, model.DEPENDEE):
+                    for position in range(model.inOffsets[k], model.inOffsets[k + 1]):
+                        e = model.inEdges[position]
+                        if model.types[e] == edgeType:
+                            label = result[:, model.sources[e]].copy()
+                            mask = ~opened & (label > 0)
+                            inputs[k].append((position, mask, label))
+                            opened |= mask
+                waiting[k] = ~opened
+        active = {}  # intention -> scenarios, in which it is evaluated
+        for k in intentions:
+            edges = [position for position in range(model.inOffsets[k], model.inOffsets[k + 1])
+                     if model.types[model.inEdges[position]] <= model.DECOMPOSITION and
+                     model.sources[model.inEdges[position]] in active]
+            if self.starts[k] == self.LEAF and model.actors[k] == actor:
+                reached = numpy.ones(scenarios, dtype=bool)
+            elif k in waiting:
+                reached = ~waiting[k]
+            else:
+                reached = numpy.zeros(scenarios, dtype=bool)
+            for position in edges:
+                reached = reached | active[model.sources[model.inEdges[position]]]
+            if not reached.any():
+                continue
+            active[k] = reached
+            values = received.get(k)
+            if values is None:
+                values = received[k] = numpy.zeros((scenarios, self.groupCounts[k]), dtype=numpy.int8)
+            got = numpy.zeros(scenarios, dtype=bool)
+            for position, mask, label in inputs.get(k, []):
+                group = self.groups[position]
+                values[:, group] = numpy.where(mask, label, values[:, group])
+                got |= mask
+            for position in edges:
+                e = model.inEdges[position]
+                label = result[:, model.sources[e]]
+                if model.types[e] == model.CONTRIBUTION:
+                    label = ContributionLink.labelMatrix[label, model.contributions[e]]
+                mask = active[model.sources[e]] & (label > 0)
+                group = self.groups[position]
+                values[:, group] = numpy.where(mask, label, values[:, group])
+                got |= mask
+            kind = model.kinds[k]
+            if kind == 1 and model.judgments[k]:
+                result[:, k] = numpy.where(reached, model.judgments[k], result[:, k])
+            elif kind <= 2 and values.shape[1]:
+                label = values.max(axis=1)
+                if kind == 2:
+                    label = numpy.where(values > 0, values, 127).min(axis=1)
+                elif kind == 1:
+                    def has(name):
+                        return (values == code[name]).any(axis=1)
+                    combined = numpy.where(has('Unknown') | has('Conflict'), code['Unknown'],
+                                           numpy.where(has('Satisfied') & ~has('Denied') & ~has('Partially Denied'),
+                                                       code['Satisfied'],
+                                                       numpy.where(has('Denied') & ~has('Satisfied') &
+                                                                   ~has('Partially Satisfied'),
+                                                                   code['Denied'], code['Unknown'])))
+                    label = numpy.where((values > 0).sum(axis=1) == 1, label, combined)
+                    inputLabel = labels[:, k]
+                    label = numpy.where((inputLabel > 0) & (inputLabel != label), code['Unknown'], label)
+                result[:, k] = numpy.where(got, label, result[:, k])
+            for e in model.outgoing(k):
+                if model.types[e] == model.DEPENDENCY:
+                    dependuum = model.targets[e]
+                    result[:, dependuum] = numpy.where(reached & (result[:, k] > 0), result[:, k],
+                                                       result[:, dependuum])
+        for k, mask in waiting.items():
+            result[:, k] = numpy.where(mask & (labels[:, k] > 0), labels[:, k], result[:, k])
+
+    def evaluateScenarios(self, labels):
+        """ Evaluates scenarios, with NumPy if available.
+
+        :param labels: list of scenarios, each a list of the input label code of each intention
+        :return: list of scenarios, each a list of the resulting label code of each intention
+        """
+        if numpy is not None:
+            labels = numpy.array(labels, dtype=numpy.int8).reshape(-1, len(self.model.names))
+            return self.evaluateMatrix(labels).tolist()
+        return [self.evaluate(scenario) for scenario in labels]
+
+
 class DevelopGoalModel(Activity):
     def __init__(self, name, guideline=None, pNode=None):
         if guideline is None:
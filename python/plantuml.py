@@ -48,12 +48,211 @@ The PlantUML-Object needs:
  * a PlanUML diagram definition without the @-Markup
  * an optional description
 
+Render Worker
+=============
+Each run of PlantUML starts a JVM, which takes about a second. For interactive use (e.g., in a REPL), a long-lived
+PlantUML process can be started, which renders the diagrams sent to it by an already warm JVM: ::
+
+    startPlantUMLWorker()
+    ...
+    node("/").genPDF()
+    ...
+    stopPlantUMLWorker()
+
+If the worker is not running or does not respond, the diagrams are rendered by a new run of PlantUML.
+
 '''
 
+import atexit
+import queue
+import subprocess
+import threading
+from collections import OrderedDict
 from ref import *
 
+plantUMLJar = './_plantUML/plantuml.jar'
+pendingDiagrams = OrderedDict()  # PlantUML source file -> (source, image file), rendered before pdflatex runs
+plantUMLWorker = None  # running PlantUMLWorker, see startPlantUMLWorker
+
+
+def plantUMLVersion():
+    """ Returns the version of PlantUML, i.e., the size and the modification time of its jar file. """
+    if 'plantuml' not in toolVersions:
+        if os.path.isfile(plantUMLJar):
+            toolVersions['plantuml'] = str(os.path.getsize(plantUMLJar)) + ':' + str(os.path.getmtime(plantUMLJar))
+        else:
+            toolVersions['plantuml'] = 'unknown'
+    return toolVersions['plantuml']
+
+
+def runPlantUML(files):
+    """ Runs PlantUML on the source files, which writes the image of each source file next to it.
+
+    :param files: names of the PlantUML source files
+    :return: exit status of PlantUML, None if it could not be started
+    """
+    try:
+        return subprocess.run(['java', '-jar', plantUMLJar] + list(files), check=False).returncode
+    except OSError as e:
+        print("PlantUML could not be started: " + str(e))
+        return None
+
+
+def modificationTime(filename):
+    return os.stat(filename).st_mtime_ns if os.path.isfile(filename) else None
+
+
+def renderPendingDiagrams():
+    """ Renders the pending diagrams in a single run of PlantUML, i.e., the JVM is started only once. PlantUML
+    writes the image of each source file next to it, hence the images are found by the nodes (see genImage). If
+    the run fails, the diagrams without a new image are rendered one by one, so that a broken diagram does not
+    keep the others from being rendered. Only new images are stored in the render cache. """
+    if not pendingDiagrams:
+        return
+    print(" ".join(pendingDiagrams))
+    before = {image: modificationTime(image) for source, image in pendingDiagrams.values()}
+    status = runPlantUML(pendingDiagrams)
+    if status:
+        print("PlantUML failed (exit status " + str(status) + "), rendering the diagrams one by one")
+        for sourceFile, (source, image) in pendingDiagrams.items():
+            if modificationTime(image) == before[image] and runPlantUML([sourceFile]):
+                print("PlantUML failed on " + sourceFile)
+    for source, image in pendingDiagrams.values():
+        if modificationTime(image) != before[image]:
+            renderCache.store(source, 'png', plantUMLVersion(), image)
+    pendingDiagrams.clear()
+
+
+renderHooks.append(renderPendingDiagrams)
+
+
+class PlantUMLWorker(object):
+    """ A long-lived PlantUML process in pipe mode. The source of a diagram is written to its standard input, the
+    image is read from its standard output up to a delimiter. A thread reads the output, so that a hanging
+    process is detected by a timeout.
+
+    :var timeout: seconds to wait for the image of a diagram
+    """
+    delimiter = b'___DOREF_PLANTUML_IMAGE_END___'
+
+    def __init__(self, jar=plantUMLJar, timeout=30):
+        self.jar = jar
+        self.timeout = timeout
+        self.process = None
+        self.output = None
+        self.buffer = b''
+        self.lock = threading.Lock()
+
+    def start(self):
+        """ Starts the PlantUML process, unless it is running. """
+        if self.isRunning():
+            return
+        self.process = subprocess.Popen(['java', '-Djava.awt.headless=true', '-jar', self.jar, '-pipe', '-tpng',
+                                         '-pipedelimitor', self.delimiter.decode()],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.output = queue.Queue()
+        self.buffer = b''
+        reader = threading.Thread(target=self.readOutput, args=(self.process.stdout, self.output))
+        reader.daemon = True
+        reader.start()
+
+    @staticmethod
+    def readOutput(stdout, output):
+        while True:
+            chunk = stdout.read1(65536)
+            if not chunk:
+                output.put(None)  # process terminated
+                return
+            output.put(chunk)
+
+    def stop(self, timeout=5):
+        """ Stops the PlantUML process, it is killed if it does not terminate within timeout seconds. """
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def isRunning(self):
+        return self.process is not None and self.process.poll() is None
+
+    def health(self):
+        """ Returns True if the process is running and renders a diagram in time. """
+        try:
+            self.renderImage('@startuml\nA -> B\n@enduml\n')
+        except OSError:
+            return False
+        return True
+
+    def render(self, source, image):
+        """ Renders the source of a diagram into the file image.
+
+        :raises: OSError: the process is not running or does not respond
+        """
+        data = self.renderImage(source)
+        with open(image, 'wb') as f:
+            f.write(data)
+
+    def renderImage(self, source):
+        """ Renders the source of a diagram and returns the image. A process, which does not respond in time, is
+        killed and replaced by a new one.
+
+        :raises: OSError: the process is not running or does not respond
+        """
+        with self.lock:
+            if not self.isRunning():
+                raise OSError('PlantUML worker is not running')
+            self.process.stdin.write(source.encode('utf-8') + b'\n')
+            self.process.stdin.flush()
+            while True:
+                index = self.buffer.find(self.delimiter)
+                if index != -1:
+                    data = self.buffer[:index]
+                    self.buffer = self.buffer[index + len(self.delimiter):].lstrip(b'\r\n')
+                    return data
+                try:
+                    chunk = self.output.get(timeout=self.timeout)
+                except queue.Empty:
+                    self.stop(timeout=0)
+                    self.start()  # a fresh process for the next diagrams
+                    raise OSError('PlantUML worker does not respond')
+                if chunk is None:
+                    self.stop()
+                    raise OSError('PlantUML worker terminated')
+                self.buffer += chunk
+
+
+def startPlantUMLWorker(timeout=30):
+    """ Starts a PlantUML worker, which renders the diagrams from now on.
+
+    :param timeout: seconds to wait for the image of a diagram
+    :return: the worker
+    """
+    global plantUMLWorker
+    if plantUMLWorker is None:
+        plantUMLWorker = PlantUMLWorker(timeout=timeout)
+    plantUMLWorker.start()
+    return plantUMLWorker
+
+
+def stopPlantUMLWorker():
+    """ Stops the PlantUML worker, the diagrams are rendered by separate runs of PlantUML again. """
+    global plantUMLWorker
+    if plantUMLWorker is not None:
+        plantUMLWorker.stop()
+        plantUMLWorker = None
+
+
+atexit.register(stopPlantUMLWorker)
+
+
 class PlantUML(Model):
     mnemonic = 'UML'
+    imageFormat = 'png'
 
     def getLabel(self):
         """
@@ -89,23 +288,23 @@ class PlantUML(Model):
         :param self:
         :return:
         """
-        self.genImage(show=False)
+        self.genImage(show=False, defer=True)
         return Figure.bodyTeX(self)
 
-    def genImage(self, overwrite=True, show=False):
+    def genImage(self, overwrite=True, show=False, defer=False):
         """
 
         :param self:
         :param overwrite:
         :param show:
+        :param defer: queue the diagram, all queued diagrams are rendered together by renderPendingDiagrams
         """
 
         vDir = Document.path
         if not os.path.isdir(vDir):
             os.mkdir(vDir)
         vDir = Document.imgPath
-        filename = self.name
-        filename = filename.replace(' ', '_')
+        filename = self.cleanFileName()
         if not os.path.isdir(vDir):
             os.mkdir(vDir)
         if overwrite is False:
@@ -124,13 +323,29 @@ class PlantUML(Model):
         texout = [r'@startuml',
                   self.plantUMLCode + '\n',
                   r'@enduml' + '\n\n']
+        source = []
         for i in texout:
             if not isinstance(i, str):
                 i = "\n".join(i)
             i = parseString(i)
+            source.append(i)
             outfile.writelines(i)
         outfile.close()
-        print(opfile)
-        os.system('java -jar ./_plantUML/plantuml.jar ' + opfile)
+        source = "".join(source)
         self.figure = filename[:-3] + "png"
+        if renderCache.fetch(source, 'png', plantUMLVersion(), vDir + self.figure):
+            return
+        if plantUMLWorker is not None and plantUMLWorker.isRunning():
+            try:
+                plantUMLWorker.render(source, vDir + self.figure)
+                renderCache.store(source, 'png', plantUMLVersion(), vDir + self.figure)
+                return
+            except OSError:
+                pass  # render by a run of PlantUML
+        if defer:
+            pendingDiagrams[opfile] = (source, vDir + self.figure)
+            return
+        print(opfile)
+        if runPlantUML([opfile]) == 0:
+            renderCache.store(source, 'png', plantUMLVersion(), vDir + self.figure)
 
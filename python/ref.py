@@ -342,6 +342,11 @@ transformed into PDF. ::
 
     node("/").genPDF()
 
+The documents can be compiled concurrently by several pdflatex processes. Each document is compiled in a build
+directory of its own. ::
+
+    node("/").genPDF(jobs=8)
+
 The full tree can be dumped on the console for testing purposes. Partial trees can be printed by calling dump()
 on the respective node. ::
 
@@ -662,10 +667,18 @@ Recommendation: look at the error trace and click on the last entry before ref.p
 The API of DO\ :sub:`RE`\ F is explained in alphabetical order in the remainder of this document.
 '''
 
+import bisect
 import copy
+import hashlib
+import json
 import re
 import os
 import os.path
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from graphviz import Digraph
 
 # Generic tree management
@@ -673,132 +686,579 @@ from graphviz import Digraph
 root = None
 cursor = None
 lastInsert = None
+treeVersion = 0  # incremented on each structural change of the RE tree
+
+
+class LRUCache(object):
+    """ A small least-recently-used cache with hit/miss statistics.
+
+    :var maxsize: maximum number of entries, the least recently used entry is dropped first
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+pathCache = LRUCache()  # path expression -> parsed expression
+nodeCache = LRUCache()  # (path expression, seed node, tree version) -> node
+referenceMap = None  # path expression -> node, resolved in advance during document generation
+referenceVersion = None  # tree version of referenceMap
+inlineReference = re.compile(r'`(/\*/[^`]*)`_')  # internal reference in a text, e.g., `/*/Power`_
+auxExtensions = ['.aux', '.toc', '.lof', '.lot', '.out']  # auxiliary files of pdflatex read by the next pass
+includedImage = re.compile(r'\\includegraphics(?:\[[^\]]*\])?\{([^}]*)\}')
+graphicsPath = re.compile(r'\\graphicspath\{((?:\{[^}]*\})+)\}')
+rerunWarning = re.compile(r'There were undefined references|Rerun to get|Label\(s\) may have changed')
+markupCache = LRUCache(maxsize=16384)  # hash of a LaTeX fragment -> (converted references, converted fragment)
+
+
+def touchTree():
+    """ Records a structural change of the RE tree (node added, removed, moved, or renamed). Resolved path
+    expressions of older tree versions are dropped. """
+    global treeVersion
+    treeVersion += 1
+    nodeCache.clear()
+
+
+def pathCacheInfo():
+    """ Returns the statistics of the path expression caches.
+
+    :return: dictionary with the statistics ('hits', 'misses', 'size', 'maxsize') of the cache of parsed
+             expressions ('parsed') and of the cache of resolved nodes ('resolved')
+    """
+    return {'parsed': pathCache.info(), 'resolved': nodeCache.info()}
+
+
+# Simple markup: tokens of links, references, and runs of asterisks (bold/italics)
+markupToken = re.compile(r'`([^<`]*)<([^>]*)>`\\_|`([^`]*)`\\?_|(\*+)')
+starRun = re.compile(r'\*+')
+emphasisOpen = '\n (['  # characters (or '\{') allowed before an opening asterisk
+emphasisClose = '\n )].!?,:;'  # characters (or '\}') allowed after a closing asterisk
+emphasisEdge = '\n |^'  # characters not allowed at the beginning or the end of emphasized text
 
 
 def parseString(string):
-    string = string.replace("\t", " ")
-    string = findLink(string)
-    string = findReference(string)
-    string = findReferenceAfterUnicode(string)
-    string = findBold(string)
-    string = findItalics(string)
-    string = findItemize(string)
-    return string
-
-
-def changeString(old, first, last, new):
-    newString = old[0:first] + new + old[last:len(old)]
-    return newString
-
-
-def findReference(text):
-    expression = r' `([^`]* )`\_'
-    replace = r' (-ref-)\1(-ref-)'
-    p = re.compile(expression, re.VERBOSE + re.UNICODE)
-    text = p.sub(replace, text)
-    split = text.split("(-ref-)")
-    out = []
-    for line in split:
-        if str(line).startswith(r'/*/'):
-            out.append(node(line).getReference())
+    """ Converts the simple markup (links, internal references, bold, italics, and bullet lists) of a LaTeX
+    string. Links, references, bold and italics are converted in a single scan of the string.
+
+    :param string: LaTeX string with markup
+    :return: LaTeX string
+    """
+    return convertItemize(convertMarkup(string, {}))
+
+
+def parseFragment(fragment):
+    """ Converts the links, internal references, bold, and italics of a LaTeX fragment, e.g., the body of an
+    element. The converted fragment is memoized by a hash of its text. A memoized fragment is reused as long as
+    the internal references in it still convert to the same text. Bullet lists span fragments and are converted
+    afterwards for the whole document (see convertItemize).
+
+    :param fragment: LaTeX string with markup
+    :return: LaTeX string
+    """
+    key = hashlib.sha1(fragment.encode('utf-8')).hexdigest()
+    entry = markupCache.get(key)
+    if entry is not None:
+        references, converted = entry
+        if all(' ' + lookupNode(path).getReference() == reference for path, reference in references.items()):
+            return converted
+    references = {}
+    converted = convertMarkup(fragment, references)
+    markupCache.put(key, (references, converted))
+    return converted
+
+
+def convertMarkup(string, references):
+    """ Converts the links, internal references, bold, and italics of a LaTeX string in a single scan.
+
+    :param string: LaTeX string with markup
+    :param references: dictionary, path expression -> converted reference, filled with the internal references
+    :return: LaTeX string
+    """
+    segments, runs = tokenizeMarkup(string.replace("\t", " "), references)
+    segments, runs = convertEmphasis(segments, runs, 2, r'\textbf{')
+    segments, runs = convertEmphasis(segments, runs, 1, r'\textit{')
+    out = [segments[0]]
+    for i in range(len(runs)):
+        out.append('*' * runs[i])
+        out.append(segments[i + 1])
+    return "".join(out)
+
+
+def tokenizeMarkup(text, references):
+    """ Scans the text once, converts links and internal references, and splits the result at runs of asterisks.
+
+    :param text: LaTeX string with markup
+    :param references: dictionary, path expression -> converted reference, filled with the internal references
+    :return: tuple (segments, runs), the text between the runs of asterisks and the lengths of the runs
+    """
+    segments = []
+    runs = []
+    current = []
+
+    def emit(converted):
+        if '*' not in converted:
+            current.append(converted)
+            return
+        pos = 0
+        for run in starRun.finditer(converted):  # converted text may contain asterisks as well
+            current.append(converted[pos:run.start()])
+            segments.append("".join(current))
+            runs.append(run.end() - run.start())
+            del current[:]
+            pos = run.end()
+        current.append(converted[pos:])
+
+    tokens = markupToken.split(text)  # text, followed by the groups of a token, text, ...
+    current.append(tokens[0])
+    for i in range(1, len(tokens), 5):
+        if tokens[i + 3] is not None:  # run of asterisks
+            segments.append("".join(current))
+            runs.append(len(tokens[i + 3]))
+            current = [tokens[i + 4]]
+            continue
+        if tokens[i + 1] is not None:  # external reference
+            emit(r'\href{' + tokens[i + 1] + '}{' + tokens[i] + '}')
+        elif tokens[i + 2].startswith(r'/*/'):  # internal reference
+            path = tokens[i + 2]
+            if path not in references:
+                references[path] = ' ' + lookupNode(path).getReference()
+            emit(references[path])
         else:
-            out.append(line)
-    text = "".join(out)
-    return text
+            emit(' ' + tokens[i + 2])
+        current.append(tokens[i + 4])
+    segments.append("".join(current))
+    return segments, runs
 
 
-def findReferenceAfterUnicode(text):
-    expression = r' `([^`]* )`\\_'
-    replace = r' (-ref-)\1(-ref-)'
-    p = re.compile(expression, re.VERBOSE + re.UNICODE)
-    text = p.sub(replace, text)
-    split = text.split("(-ref-)")
+def convertEmphasis(segments, runs, stars, command):
+    """ Converts pairs of runs of asterisks to emphasized text (bold or italics).
+
+    Emphasized text must not contain asterisks. It is preceded by a blank, a line break, an opening bracket or an
+    escaped opening brace and followed by a blank, a line break, a punctuation mark, a closing bracket or an escaped
+    closing brace. A character which closes an emphasis cannot open the next one.
+
+    :param segments: text between the runs of asterisks
+    :param runs: lengths of the runs of asterisks
+    :param stars: number of asterisks which mark this kind of emphasis
+    :param command: LaTeX command
+    :return: tuple (segments, runs) of the remaining runs of asterisks
+    """
+    newSegments = []
+    newRuns = []
+    current = [segments[0]]
+    closed = -2  # index of the run, which closed the previous emphasis
+    consumed = 0  # length of the character(s) following the previous emphasis
+    i = 0
+    while i < len(runs):
+        if i + 1 < len(runs) and runs[i] == stars and runs[i + 1] == stars:
+            before = segments[i]
+            content = segments[i + 1]
+            after = segments[i + 2]
+            if before[-1:] and before[-1:] in emphasisOpen:
+                opening = 1
+            elif before.endswith('\\{'):
+                opening = 2
+            else:
+                opening = 0
+            if after[:1] and after[:1] in emphasisClose:
+                closing = 1
+            elif after.startswith('\\}'):
+                closing = 2
+            else:
+                closing = 0
+            if opening and closing and len(content) >= 2 and content[0] not in emphasisEdge and \
+                    content[-1] not in emphasisEdge and not (closed == i - 1 and len(before) - opening < consumed):
+                current.append(command + content + '}')
+                current.append(after)
+                closed = i + 1
+                consumed = closing
+                i += 2
+                continue
+        newSegments.append("".join(current))
+        newRuns.append(runs[i])
+        current = [segments[i + 1]]
+        i += 1
+    newSegments.append("".join(current))
+    return newSegments, newRuns
+
+
+def convertItemize(text):
+    """ Converts the bullet lists of a LaTeX string into itemize environments in a single pass over its lines.
+
+    A paragraph that starts with '* ' is a bullet list, every line of it that starts with '* ' becomes an item.
+    The indentation of the items is kept on a stack: a deeper indented item opens a nested list, a less indented
+    item closes the nested lists down to its own level. Lines that are no items are continuation lines.
+
+    :param text: LaTeX string with bullet lists
+    :return: LaTeX string
+    """
     out = []
-    for line in split:
-        if str(line).startswith(r'/*/'):
-            out.append(node(line).getReference())
+    for paragraph in text.split("\n\n"):
+        lines = paragraph.split("\n")
+        bullets = paragraph.lstrip(' ').startswith('* ')
+        stack = []  # indentation of the open lists
+        for i in range(len(lines)):
+            line = lines[i]
+            content = line.lstrip(' ')
+            indent = len(line) - len(content)
+            if bullets and content.startswith('* '):
+                content = '\\item ' + content[2:]
+            elif not content.startswith('\\item '):
+                continue
+            if not stack:
+                stack.append(indent)
+                lines[i] = ' ' * indent + "\n" + r"\begin{itemize}" + "\n" + ' ' * indent + content
+                continue
+            closed = 0
+            while len(stack) > 1 and stack[-2] >= indent:
+                stack.pop()
+                closed += 1
+            if indent > stack[-1]:
+                stack.append(indent)
+                lines[i] = ' ' * indent + r"\begin{itemize}" + "\n" + ' ' * (indent + 1) + content
+                continue
+            stack[-1] = indent  # an item between the parent list and the current list joins the current list
+            if closed:
+                lines[i] = ' ' * indent + (r"\end{itemize}" + "\n") * closed + ' ' * (indent + 1) + content
+            else:
+                lines[i] = ' ' * indent + content
+        part = "\n" + "\n".join(lines)
+        if stack:
+            part += "\n" + (r"\end{itemize}" + "\n") * len(stack)
+        out.append(part)
+
+    return "\n".join(out)
+
+
+def compilePDF(texFile, log=False, maxPasses=4):
+    """ Compiles a LaTeX file into a PDF. The file is compiled in a build directory of its own (next to the file),
+    from which the PDF (and the log file) are moved next to the LaTeX file. Thus, documents can be compiled
+    concurrently (see genPDF). The auxiliary files are kept in the build directory for the next build.
+
+    pdflatex is rerun as long as the auxiliary files (table of contents, lists of figures and tables, labels)
+    change or the log reports undefined references, but at most maxPasses times. An unchanged document is
+    compiled in a single pass.
+
+    :param texFile: name of the LaTeX file
+    :param log: keep the log file of pdflatex
+    :param maxPasses: maximum number of pdflatex passes
+    :return: name of the PDF file, None if pdflatex failed or produced no PDF
+    """
+    vDir, filename = os.path.split(os.path.abspath(texFile))
+    name = os.path.splitext(filename)[0]
+    buildDir = os.path.join(vDir, 'build', name)
+    if not os.path.isdir(buildDir):
+        os.makedirs(buildDir)
+    with open(texFile, 'r', encoding='utf-8') as f:
+        shellEscape = r'\usepackage{epstopdf}' in f.read()  # EPS images are converted by an external tool
+    command = 'pdflatex ' + ('-shell-escape ' if shellEscape else '') + '-synctex=1 -interaction=batchmode ' + \
+              '-output-directory=' + buildDir + ' ' + texFile
+    auxFiles = [os.path.join(buildDir, name + ext) for ext in auxExtensions]
+    pdfFile = os.path.join(buildDir, name + '.pdf')
+    if os.path.isfile(pdfFile):  # left by a failed build
+        os.remove(pdfFile)
+    hashes = hashFiles(auxFiles)
+    status = 0
+    for n in range(maxPasses):
+        status = os.system(command)
+        print("")
+        if status != 0:
+            break
+        lastHashes, hashes = hashes, hashFiles(auxFiles)
+        if hashes == lastHashes and not rerunRequired(os.path.join(buildDir, name + '.log')):
+            break
+    if log is True and os.path.isfile(os.path.join(buildDir, name + '.log')):
+        os.replace(os.path.join(buildDir, name + '.log'), os.path.join(vDir, name + '.log'))
+    if status != 0 or not os.path.isfile(pdfFile):
+        print("pdflatex failed on " + texFile + " (exit status " + str(status) + ")")
+        return None
+    os.replace(pdfFile, os.path.join(vDir, name + '.pdf'))
+    return os.path.join(vDir, name + '.pdf')
+
+
+def hashFiles(files):
+    """ Returns the SHA-1 hashes of the contents of the files (None for a missing file). """
+    hashes = []
+    for filename in files:
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                hashes.append(hashlib.sha1(f.read()).hexdigest())
         else:
-            out.append(line)
-    text = "".join(out)
-    return text
+            hashes.append(None)
+    return hashes
 
 
-def findLink(text):
-    expression = r' `( [^<`]* ) \< ( [^>]* ) \>`\\_ '
-    replace = r'\\href{\2}{\1}'
-    p = re.compile(expression, re.VERBOSE + re.UNICODE)
-    text = p.sub(replace, text)
-    return text
+def rerunRequired(logFile):
+    """ Returns True if the log file of pdflatex reports undefined references or asks for a rerun. """
+    if not os.path.isfile(logFile):
+        return False
+    with open(logFile, 'r', encoding='latin-1') as f:
+        return rerunWarning.search(f.read()) is not None
 
 
-def findBold(text):
-    expression = r'(\n | \  | \( | \\\{ | \[ ) \*\*( [^**\ | ^**\n]+ [^**]* [^**\ | ^**\n]+  )\*\* ' \
-                 r'( \n | \ | \) | \\\} | \] | \. | \! | \? | \, | \: | \; )'
-    replace = r'\1\\textbf{\2}\3'
-    p = re.compile(expression, re.VERBOSE + re.UNICODE)
-    text = p.sub(replace, text)
-    return text
+def findImage(image, directories):
+    """ Returns the file pdflatex (graphicx) includes for an image name: the file in the working directory or else
+    in one of the directories (of graphicspath). A name without extension is completed by the first extension in
+    Figure.graphicsExtensions, for which a file exists.
 
+    :param image: name of the image as in \\includegraphics
+    :param directories: directories searched after the working directory
+    :return: name of the file, None if there is none
+    """
+    names = [image] if os.path.splitext(image)[1] else [image + extension for extension in Figure.graphicsExtensions]
+    for name in names:
+        for directory in [''] + directories:
+            if os.path.isfile(os.path.join(directory, name)):
+                return os.path.join(directory, name)
+    return None
 
-def findItalics(text):
-    expression = r'(\n | \  | \( | \\\{ | \[ ) \* ( [^*\ | ^*\n]+ [^*]* [^*\ | ^*\n]+  )\* ' \
-                 r'( \n | \ | \) | \\\} | \] | \. | \! | \? | \, | \: | \; )'
-    replace = r'\1\\textit{\2}\3'
-    p = re.compile(expression, re.VERBOSE)
-    text = p.sub(replace, text)
-    return text
 
+class BuildManifest(object):
+    """ The build manifest records the inputs of each built PDF, i.e., the hashes of the contents of its LaTeX file
+    and of each included image. It is stored in the file manifest.json under Document.path.
 
-def findItemize(text):
-    split = text.split("\n\n")
-    out = []
-    for part in split:
-        part = "\n" + part
-        index = part.find('* ')
-        if index != -1:
-            i = 1
-            while index - i > 0 and part[index - i] == ' ':
-                i += 1
-            if index - i == 0 or index == 0:
-                expression = r'(\n\ *) \*\ ( [^(\n\*\ )(\ \*\ )]* )'
-                replace = r'\1\\item \2'
-                p = re.compile(expression, re.VERBOSE + re.UNICODE)
-                part = p.sub(replace, part)
-        index = part.find('\\item ')
-        if index != -1:
-            lastindex = 0
-            newtab = 0
-            while index - newtab > lastindex and part[index - newtab] != '\n':
-                newtab += 1
-            tab = newtab
-
-            part = part[:index] + "\n" + r"\begin{itemize}" + "\n" + (' ' * (newtab - 1)) + part[index:]
-            while index != -1:
-                index = part.find(r"\item ", lastindex)
-
-                if index != -1:
-                    newtab = 0
-                    while index - newtab > lastindex and part[index - newtab] != '\n':
-                        newtab += 1
-                    if newtab > tab:
-                        part = part[:index] + r"\begin{itemize}" + "\n" + (' ' * newtab) + part[index:]
-                        lastindex = index + 21 + newtab
-                    elif newtab < tab:
-
-                        part = part[:index] + (r"\end{itemize}" + "\n") * (tab - newtab) + (' ' * newtab) + part[index:]
-
-                        lastindex = index + 5 + 14 * (tab - newtab) + newtab
-                    else:
-                        lastindex = index + 5
-                    tab = newtab
-            begin = part.count(r"\begin")
-            end = part.count(r"\end")
-            part = part + "\n" + (r"\end{itemize}" + "\n") * (begin - end)
-            out.append(part)
-        else:
-            out.append(part)
+    :var filename: name of the manifest file
+    :var entries: dictionary, LaTeX file (relative to Document.path) -> hashes of the inputs
+    """
 
-    return "\n".join(out)
+    def __init__(self, path):
+        self.path = path
+        self.filename = os.path.join(path, 'manifest.json')
+        self.entries = {}
+        self.current = {}  # hashes of the inputs computed by this build
+        if os.path.isfile(self.filename):
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except ValueError:  # damaged manifest, build everything
+                self.entries = {}
+
+    def key(self, texFile):
+        return os.path.relpath(texFile, self.path).replace('\\', '/')
+
+    def inputs(self, texFile):
+        """ Returns the hashes of the LaTeX file and of the images included by it. The images are found as pdflatex
+        finds them (see findImage), in the directories of graphicspath. """
+        key = self.key(texFile)
+        if key not in self.current:
+            with open(texFile, 'r', encoding='utf-8') as f:
+                tex = f.read()
+            directories = []
+            for paths in graphicsPath.findall(tex):
+                directories += re.findall(r'\{([^}]*)\}', paths)
+            hashes = {}
+            for image in includedImage.findall(tex):
+                found = findImage(image, directories)
+                hashes[image] = hashFiles([found])[0] if found else None
+            self.current[key] = {'tex': hashFiles([texFile])[0], 'images': hashes}
+        return self.current[key]
+
+    def changed(self, texFile):
+        """ Returns True if the PDF of the LaTeX file is missing or one of its inputs changed. """
+        if not os.path.isfile(os.path.splitext(texFile)[0] + '.pdf'):
+            return True
+        return self.entries.get(self.key(texFile)) != self.inputs(texFile)
+
+    def update(self, texFile):
+        self.entries[self.key(texFile)] = self.inputs(texFile)
+
+    def save(self):
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+
+
+class RenderCache(object):
+    """ Content-addressed cache of rendered diagrams (Graphviz, PlantUML). A rendered diagram is stored under the
+    hash of its source, its format, and the version of the rendering tool in the directory '.cache' under
+    Document.imgPath. An unchanged diagram is copied from the cache instead of being rendered again. The least
+    recently used diagrams are evicted if the cache exceeds maxSize bytes. The cache may be used by several
+    threads (see queueRender).
+
+    :var maxSize: maximum size of the cache in bytes
+    """
+
+    def __init__(self, maxSize=256 * 1024 * 1024):
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def directory(self):
+        return os.path.join(Document.imgPath, '.cache')
+
+    def cacheFile(self, source, imageFormat, version):
+        key = hashlib.sha1((version + '\0' + imageFormat + '\0' + source).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory(), key + '.' + imageFormat)
+
+    def fetch(self, source, imageFormat, version, target):
+        """ Copies the cached diagram to the file target.
+
+        :return: True if the diagram was in the cache
+        """
+        cached = self.cacheFile(source, imageFormat, version)
+        with self.lock:
+            if not os.path.isfile(cached):
+                self.misses += 1
+                return False
+            shutil.copyfile(cached, target)
+            os.utime(cached)  # recently used
+            self.hits += 1
+        return True
+
+    def store(self, source, imageFormat, version, target):
+        """ Stores the rendered diagram in the file target in the cache. """
+        if not os.path.isfile(target):  # rendering failed
+            return
+        with self.lock:
+            if not os.path.isdir(self.directory()):
+                os.makedirs(self.directory())
+            shutil.copyfile(target, self.cacheFile(source, imageFormat, version))
+            self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory()):
+            if entry.is_file():
+                entries.append((entry.stat().st_mtime, entry.stat().st_size, entry.path))
+        size = sum(entry[1] for entry in entries)
+        for mtime, fileSize, path in sorted(entries):
+            if size <= self.maxSize:
+                break
+            os.remove(path)
+            size -= fileSize
+
+    def clear(self):
+        shutil.rmtree(self.directory(), ignore_errors=True)
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'maxSize': self.maxSize}
+
+
+renderCache = RenderCache()
+toolVersions = {}  # tool -> version string
+renderHooks = []  # functions rendering queued images, called after LaTeX generation and before pdflatex runs
+renderWorkers = os.cpu_count() or 4  # maximum number of images rendered concurrently
+renderPool = None  # thread pool rendering the queued images, created on demand
+renderJobs = []  # queued render jobs (futures)
+
+
+def flushRenders():
+    """ Renders the images queued during LaTeX generation (see renderHooks). """
+    for hook in renderHooks:
+        hook()
+
+
+def graphvizVersion():
+    """ Returns the version of Graphviz (dot -V), 'unknown' if dot cannot be run. """
+    if 'dot' not in toolVersions:
+        try:
+            toolVersions['dot'] = subprocess.run(['dot', '-V'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                                 universal_newlines=True).stdout.strip()
+        except OSError:
+            toolVersions['dot'] = 'unknown'
+    return toolVersions['dot']
+
+
+def queueRender(function, *args):
+    """ Queues a render job, i.e., the function is called with the arguments by a thread of the render pool. The
+    queued jobs are joined by joinRenders before pdflatex runs. """
+    global renderPool
+    if renderPool is None:
+        renderPool = ThreadPoolExecutor(max_workers=renderWorkers)
+    renderJobs.append(renderPool.submit(function, *args))
+
+
+def joinRenders():
+    """ Waits for the queued render jobs, the first error of a job is raised. """
+    jobs = renderJobs[:]
+    del renderJobs[:]
+    for job in jobs:
+        job.result()
+
+
+renderHooks.append(joinRenders)
+
+
+def renderDot(dot, filename, defer=False):
+    """ Renders a Graphviz model into the file filename + '.' + dot.format (and saves its source into filename).
+    An unchanged model is copied from the render cache.
+
+    :param dot: Graphviz model
+    :param filename: file name without extension
+    :param defer: queue the rendering (see queueRender)
+    """
+    if defer:
+        queueRender(renderDot, dot, filename)
+        return
+    target = filename + '.' + dot.format
+    if renderCache.fetch(dot.source, dot.format, graphvizVersion(), target):
+        dot.save(filename)
+    else:
+        dot.render(filename, view=False)
+        renderCache.store(dot.source, dot.format, graphvizVersion(), target)
+
+
+class TeXWriter(object):
+    """ Streams the LaTeX code of a document into a file. The nodes write their fragments with append() (as
+    formerly into a list, see genTeX). Each fragment is converted by parseFragment. Complete paragraphs are
+    flushed to the file as soon as chunkSize characters are buffered, bullet lists are converted on flushing.
+    Thus, only the current paragraphs of the document are kept in memory.
+
+    :var chunkSize: number of buffered characters that triggers a flush
+    """
+    chunkSize = 65536
+
+    def __init__(self, outfile):
+        self.outfile = outfile
+        self.pending = []  # converted fragments, not flushed yet
+        self.pendingSize = 0
+
+    def append(self, fragment):
+        if not isinstance(fragment, str):
+            fragment = "\n".join(fragment)
+        converted = parseFragment(fragment)
+        self.pending.append(converted)
+        self.pendingSize += len(converted)
+        if self.pendingSize >= self.chunkSize:
+            self.flush()
+
+    def flush(self):
+        """ Writes the complete paragraphs, the last paragraph may be continued by the next fragment. """
+        paragraphs = "".join(self.pending).split("\n\n")
+        if len(paragraphs) == 1:
+            return
+        self.outfile.write(convertItemize("\n\n".join(paragraphs[:-1])) + "\n")
+        self.pending = [paragraphs[-1]]
+        self.pendingSize = len(paragraphs[-1])
+
+    def close(self):
+        """ Writes the remaining paragraphs. The file is not closed. """
+        self.outfile.write(convertItemize("".join(self.pending)))
+        self.pending = []
+        self.pendingSize = 0
 
 
 def cd(path):
@@ -834,16 +1294,144 @@ def node(path):
     elif path == "..":
         node_ = cursor.getParent()
     else:
+        relative, patharray = parsePath(path)
+        if relative:
+            seed = cursor
+        else:
+            seed = root
+        key = (path, seed, treeVersion)
+        node_ = nodeCache.get(key)
+        if node_ is None:
+            node_ = nodeR(seed, list(patharray), False)
+            nodeCache.put(key, node_)
+    return node_
+
+
+def lookupNode(path):
+    """ Returns the node object specified by a path expression. During document generation, the node is taken
+    from the references resolved in advance by resolvePaths, otherwise node() is used.
+
+    :param path: path expression
+
+    :return: node object
+    """
+    if referenceMap is not None and referenceVersion == treeVersion and path in referenceMap:
+        return referenceMap[path]
+    return node(path)
+
+
+def resolvePaths(paths):
+    """ Resolves a collection of path expressions in a single traversal of the RE tree. The result is the same as
+    calling node() for each path: each step of a path refers to the first node in document order (below the node
+    matched by the previous step) whose name starts with the name given in the step.
+
+    :param paths: path expressions (absolute or relative to the current directory)
+
+    :return: dictionary path expression -> node, paths which cannot be resolved are omitted
+    """
+    resolved = {}
+    seeds = {}  # seed node -> entries starting there
+    for path in set(paths):
+        if path == "./-" or path == "..":
+            continue
+        try:
+            relative, steps = parsePath(path)
+        except NameError:
+            continue
+        names = []
+        i = 0
+        while i < len(steps) and steps[i] != '':
+            if steps[i] != '*' or i + 1 >= len(steps):
+                names = None  # misformed, left to node()
+                break
+            names.append(steps[i + 1])
+            i += 2
+        if names is None:
+            continue
+        if relative:
+            seed = cursor
+        else:
+            seed = root
+        if not names:
+            resolved[path] = seed
+        else:
+            seeds.setdefault(seed, []).append(PathEntry(path, names))
+
+    waiting = {}  # name of the next step -> entries
+    lengths = {}  # length of a name in waiting -> number of such names
+    anchored = {}  # node -> entries waiting for a match in the subtree of the node
+
+    def wait(entry, anchor):
+        entry.anchor = anchor
+        name = entry.names[entry.step]
+        if name not in waiting:
+            waiting[name] = []
+            lengths[len(name)] = lengths.get(len(name), 0) + 1
+        waiting[name].append(entry)
+        anchored.setdefault(anchor, []).append(entry)
+
+    stack = [(root, False)]
+    while stack and seeds:
+        n, leave = stack.pop()
+        if leave:
+            for entry in anchored.pop(n, []):
+                if entry.anchor is n:  # no match in the subtree
+                    entry.anchor = None
+            continue
+        for entry in seeds.get(n, []):  # the seed itself may match the first step
+            wait(entry, n)
+        matched = []
+        if n.name is not None:
+            for length in [length for length in lengths if length <= len(n.name)]:
+                prefix = n.name[:length]
+                if prefix in waiting:
+                    matched.extend(entry for entry in waiting.pop(prefix) if entry.anchor is not None)
+                    lengths[length] -= 1
+                    if lengths[length] == 0:
+                        del lengths[length]
+        for entry in matched:
+            entry.step += 1
+            if entry.step == len(entry.names):
+                resolved[entry.path] = n
+            else:
+                wait(entry, n)
+        stack.append((n, True))
+        for child in reversed(n.nodes):
+            stack.append((child, False))
+    return resolved
+
+
+class PathEntry(object):
+    """ State of a path expression during resolvePaths """
+
+    def __init__(self, path, names):
+        self.path = path
+        self.names = names
+        self.step = 0  # index of the next name to be matched
+        self.anchor = None  # node matched by the previous step
+
+
+def parsePath(path):
+    """ Splits a path expression into its steps. Parsed expressions are cached.
+
+    :param path: path expression, e.g., '/`*`/node_x'
+
+    :return: tuple (relative, steps), relative is true for expressions starting with '.'
+
+    :raises: NameError: misformed path
+    """
+    parsed = pathCache.get(path)
+    if parsed is None:
         patharray = path.split('/')
         if patharray[0] == '.':
-            seed = cursor
+            relative = True
         elif patharray[0] == '':
-            seed = root
+            relative = False
         else:
             raise NameError("misformed path!")
-        del patharray[0]
-        node_ = nodeR(seed, patharray, False)
-    return node_
+        parsed = (relative, tuple(patharray[1:]))
+        pathCache.put(path, parsed)
+    return parsed
 
 
 def nodeR(pNode, pathArray, nextLevel):
@@ -910,6 +1498,8 @@ def rm(delNode, delAttribute=None):
         cursor = delNode.getParent()
         lastInsert = delNode.getParent()
         delNode.getParent().delNode(delNode)  # remove node from parent
+        nameIndex.removeTree(delNode)
+        touchTree()
         del delNode  # remove subtree
     else:
         if hasattr(delNode, delAttribute):
@@ -939,6 +1529,22 @@ def mv(movNode, destination, position=None):
     else:
         destination.nodes.append(movNode)
     movNode.parent = destination
+    placeNodes(destination, movNode)
+    touchTree()
+
+
+def placeNodes(destination, n):
+    """ Updates the position keys of the name index after node n was inserted into the child nodes of destination.
+
+    :param destination: parent node of n
+
+    :param n: inserted node
+    """
+    if destination.nodes[-1] is n:
+        nameIndex.placeTree(n)
+    else:  # the ranks of the siblings have to be reassigned in their order
+        for child in destination.nodes:
+            nameIndex.placeTree(child)
 
 
 def clone(cpNode, destination, position=None):
@@ -962,6 +1568,100 @@ def clone(cpNode, destination, position=None):
     else:
         destination.nodes.append(newNode)
     newNode.parent = destination
+    placeNodes(destination, newNode)
+    nameIndex.addTree(newNode)
+    touchTree()
+
+
+class NameIndex(object):
+    """ Index of the names of all nodes in the RE tree. Path expressions are resolved by the index instead of
+    a depth-first scan of the whole tree.
+
+    The index maps each name to the nodes carrying this name and keeps a sorted list of all names. A name in a
+    path expression matches every node whose name starts with it, hence the candidates are found by a binary
+    search in the sorted list. Among the candidates below the seed node, the first one in document order wins.
+
+    Each node holds its position in the tree as indexKey, the tuple of the ranks of the node and its ancestors
+    among their siblings, assigned when the node is placed into the tree. Document order is the lexicographic
+    order of these keys, and a node is below seed if the key of seed is a prefix of its key.
+    """
+
+    def __init__(self):
+        self.nodesByName = {}  # exact name -> nodes with this name (keys of a dict, for removal in O(1))
+        self.names = []  # sorted list of all names in the index, removed names are dropped in batches
+        self.rank = 0  # last rank assigned, the ranks of siblings increase in their order
+
+    def clear(self):
+        self.nodesByName = {}
+        self.names = []
+        self.rank = 0
+
+    def place(self, n):
+        """ Assigns the position key to node n, which is the root or the last child of its parent. """
+        self.rank += 1
+        n.indexKey = () if n.parent is None else n.parent.indexKey + (self.rank,)
+
+    def placeTree(self, n):
+        self.place(n)
+        for child in n.nodes:
+            self.placeTree(child)
+
+    def add(self, n):
+        if n.name is None:
+            return
+        if n.name in self.nodesByName:
+            self.nodesByName[n.name][n] = None
+        else:
+            self.nodesByName[n.name] = {n: None}
+            i = bisect.bisect_left(self.names, n.name)
+            if i == len(self.names) or self.names[i] != n.name:
+                self.names.insert(i, n.name)
+
+    def remove(self, n):
+        entries = self.nodesByName.get(n.name)
+        if entries is not None:
+            entries.pop(n, None)
+            if not entries:
+                del self.nodesByName[n.name]
+                if 2 * len(self.nodesByName) < len(self.names):
+                    self.names = [name for name in self.names if name in self.nodesByName]
+
+    def addTree(self, n):
+        self.add(n)
+        for child in n.nodes:
+            self.addTree(child)
+
+    def removeTree(self, n):
+        self.remove(n)
+        for child in n.nodes:
+            self.removeTree(child)
+
+    def find(self, seed, name, nextLevel):
+        """ Returns the first node in document order below seed whose name starts with name.
+
+        :param seed: root of the subtree to be searched
+
+        :param name: (beginning of the) name of the node
+
+        :param nextLevel: if true, seed itself is not a match
+
+        :return: node or None
+        """
+        found = None
+        key = seed.indexKey
+        depth = len(key)
+        i = bisect.bisect_left(self.names, name)
+        while i < len(self.names) and self.names[i].startswith(name):
+            for candidate in self.nodesByName.get(self.names[i], ()):
+                position = candidate.indexKey
+                if position[:depth] == key and (found is None or position < found.indexKey) and \
+                        not (nextLevel and candidate is seed):
+                    found = candidate
+            i += 1
+        return found
+
+
+nameIndex = NameIndex()
 
 
 class Node(object):
@@ -977,6 +1677,10 @@ class Node(object):
         else:  # root of tree, init globals
             root = self
             cursor = self
+            nameIndex.clear()
+        nameIndex.place(self)
+        nameIndex.add(self)
+        touchTree()
         lastInsert = self
         self.id = self.getID()  # assign world-unique ID
 
@@ -1009,10 +1713,15 @@ class Node(object):
         :raises: AttributeError if attribute is not in node
         """
         if not callable(getattr(self, attribute)):  # it is only allowed to overwrite true attributes but not methods
+            if attribute == 'name':
+                nameIndex.remove(self)
             if isinstance(value, str):
                 setattr(self, attribute, ' '.join(value.split()))  # remove unnecessary whitespaces in multi-line string
             else:
                 setattr(self, attribute, value)
+            if attribute == 'name':
+                nameIndex.add(self)
+                touchTree()
 
     def getParent(self):
         return self.parent
@@ -1030,15 +1739,7 @@ class Node(object):
         return self.name
 
     def getNodeByName(self, name, nextLevel):
-        if not nextLevel and self.name.startswith(name):
-            return self
-        else:
-            ret = None
-            for n in self.nodes:
-                ret = n.getNodeByName(name, False)
-                if ret is not None:
-                    break
-            return ret
+        return nameIndex.find(self, name, nextLevel)
 
     def dump(self):
         print(type(self).__name__ + ' \'' + self.getName() + '\'')
@@ -1051,12 +1752,41 @@ class Node(object):
             n.genTxt(index, number)
             index += 1
 
-    def genPDF(self, overwrite=True, log=False):
-        """ Traverses the tree from the current node and generates a PDF for each document.
+    def genPDF(self, overwrite=True, log=False, jobs=1):
+        """ Traverses the tree from the current node and generates a PDF for each document. A document is only
+        compiled if its LaTeX file or one of its images changed since its last build (see BuildManifest).
 
+        :param jobs: number of documents compiled concurrently by pdflatex
+        :return: list of the rebuilt PDF files, without the documents pdflatex failed on
+        """
+        texFiles = []
+        self.genTeXFiles(overwrite, texFiles)
+        flushRenders()
+        manifest = BuildManifest(Document.path)
+        changed = [texFile for texFile in texFiles if manifest.changed(texFile)]
+        if jobs <= 1 or len(changed) <= 1:
+            pdfFiles = [compilePDF(texFile, log) for texFile in changed]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                builds = [pool.submit(compilePDF, texFile, log) for texFile in changed]
+                pdfFiles = [build.result() for build in builds]
+        failed = [texFile for texFile, pdfFile in zip(changed, pdfFiles) if pdfFile is None]
+        for texFile in changed:
+            if texFile not in failed:
+                manifest.update(texFile)
+        manifest.save()
+        for texFile in texFiles:
+            status = "Failed: " if texFile in failed else "Rebuilt: " if texFile in changed else "Up to date: "
+            print(status + os.path.splitext(texFile)[0] + '.pdf')
+        return [pdfFile for pdfFile in pdfFiles if pdfFile is not None]
+
+    def genTeXFiles(self, overwrite, texFiles):
+        """ Traverses the tree from the current node and generates the LaTeX file of each document.
+
+        :param texFiles: list to which the names of the LaTeX files are appended
         """
         for n in self.nodes:
-            n.genPDF(overwrite=overwrite, log=log)
+            n.genTeXFiles(overwrite, texFiles)
 
     def genTeX(self, outArray, level, index, number):
         level += 1
@@ -1101,6 +1831,23 @@ class Node(object):
     def genRstBody(self, rstOut):
         pass
 
+    def collectPaths(self, paths):
+        """ Traverses the tree from the current node and collects the path expressions used in traces and
+        internal references.
+
+        :param paths: list to which the path expressions are appended
+        """
+        for n in self.nodes:
+            n.collectPaths(paths)
+
+    def collectImages(self, images):
+        """ Traverses the tree from the current node and collects the file names of the images shown in a document.
+
+        :param images: list to which the file names are appended
+        """
+        for n in self.nodes:
+            n.collectImages(images)
+
     def genDot(self, dot):
         """ Traverses the tree from the current node and generates a graphviz model.
 
@@ -1116,28 +1863,44 @@ class Node(object):
             n.do()
 
 
+latexEscapes = {'\\': r'\textbackslash ', '_': r'\_', '<': r'\textless ', '>': r'\textgreater ', '$': r'\$',
+                '&': r'\&', '#': r'\#', '{': r'\{', '}': r'\}', '%': r'\%', '~': r'\textasciitilde ',
+                '€': r'\texteuro '}  # character with a special meaning in LaTeX -> escaped character
+latexEscapeTable = str.maketrans(latexEscapes)
+latexSpecial = re.compile('[' + re.escape(''.join(latexEscapes)) + ']')
+escapeCache = LRUCache(maxsize=8192)  # short string (e.g., name, table cell) -> escaped string
+escapeCacheLength = 80  # strings up to this length are memoized
+
+
 def getUnicodeStr(tmpStr):
     """ This function escapes all characters with a special meaning in LaTeX
 
     :param tmpStr: Input String
     :return: Escaped string
     """
-    split = tmpStr.split("`")
+    if len(tmpStr) > escapeCacheLength:
+        return escapeSegments(tmpStr)
+    escaped = escapeCache.get(tmpStr)
+    if escaped is None:
+        escaped = escapeSegments(tmpStr)
+        escapeCache.put(tmpStr, escaped)
+    return escaped
+
+
+def escapeSegments(text):
+    """ Escapes the segments of a string between backticks. Segments with internal references ('/*/') or URLs
+    ('<http:', '<www.') are kept.
+
+    :param text: Input String
+    :return: Escaped string
+    """
     out = []
-    for part in split:
+    for part in text.split("`"):
         if part.find("/*/") == -1 and part.find("<http:") == -1 and part.find("<www.") == -1:
-            part = part.replace('\\', r'\textbackslash ')
-            part = part.replace('_', '\_')
-            part = part.replace('<', r'\textless ')
-            part = part.replace('>', r'\textgreater ')
-            part = part.replace('$', r'\$')
-            part = part.replace('&', r'\&')
-            part = part.replace('#', r'\#')
-            part = part.replace('{', r'\{')
-            part = part.replace('}', r'\}')
-            part = part.replace('%', r'\%')
-            part = part.replace('~', r'\textasciitilde ')
-            part = part.replace('€', r'\texteuro ')
+            if part.isascii():
+                part = part.translate(latexEscapeTable)
+            else:  # translate is slow for non-ASCII strings (e.g., umlauts)
+                part = latexSpecial.sub(lambda special: latexEscapes[special.group()], part)
         out.append(part)
     return '`'.join(out)
 
@@ -1543,7 +2306,14 @@ class Document(Product):
         Node.genTxt(self, 0, "")
         print('\n=======================================\n')
 
-    def genPDF(self, overwrite=True, log=False):
+    def genTeXFiles(self, overwrite, texFiles):
+        texFiles.append(self.genTeXFile(overwrite))
+
+    def genTeXFile(self, overwrite=True):
+        """ Generates the LaTeX file of the document. An existing file with the same content is not rewritten.
+
+        :return: name of the LaTeX file
+        """
         vDir = Document.path
         if not os.path.isdir(vDir):
             os.mkdir(vDir)
@@ -1560,7 +2330,7 @@ class Document(Product):
             opfile = filename + '_' + str(n) + '.tex'
         else:
             opfile = filename + '.tex'
-        outfile = open(opfile, 'w', encoding='utf-8')
+        outfile = open(opfile + '.new', 'w', encoding='utf-8')
 
         docAuthor = []
         for author in self.authors:
@@ -1580,42 +2350,40 @@ class Document(Product):
                   r'\graphicspath{{' + Document.imgPath + r'}}' + '\n',
                   r'\usepackage[colorlinks, linkcolor = black, citecolor = black, filecolor = black, ' +
                   r'urlcolor = blue, bookmarks=true]{hyperref}' + '\n',
-                  r'\usepackage{babel}' + '\n',
-                  r'\usepackage{epstopdf}' + '\n',
-                  r'\usepackage{tabularx}' + '\n',
-                  r'\usepackage{tabulary}' + '\n',
-                  r'\setcounter{secnumdepth}{5}' + '\n\n',
-                  r'\begin{document}' + '\n',
-                  r'\title{' + self.name + '}' + '\n',
-                  r'\author{' + r' \and '.join(docAuthor) + r'}' + '\n',
-                  r'\date{\today}' + '\n',
-                  r'\maketitle' + '\n',
-                  r'\tableofcontents' + '\n',
-                  r'\listoffigures' + '\n',
-                  r'\listoftables' + '\n\n']
-        Node.genTeX(self, texout, 0, 1, "")
-        texout.append(r'\end{document}' + '\n')
-        out = ""
+                  r'\usepackage{babel}' + '\n']
+        images = []
+        self.collectImages(images)
+        if any(image.lower().endswith('.eps') for image in images):  # EPS is converted by pdflatex
+            texout.append(r'\usepackage{epstopdf}' + '\n')
+        texout += [r'\usepackage{tabularx}' + '\n',
+                   r'\usepackage{tabulary}' + '\n',
+                   r'\setcounter{secnumdepth}{5}' + '\n\n',
+                   r'\begin{document}' + '\n',
+                   r'\title{' + self.name + '}' + '\n',
+                   r'\author{' + r' \and '.join(docAuthor) + r'}' + '\n',
+                   r'\date{\today}' + '\n',
+                   r'\maketitle' + '\n',
+                   r'\tableofcontents' + '\n',
+                   r'\listoffigures' + '\n',
+                   r'\listoftables' + '\n\n']
+        global referenceMap, referenceVersion
+        paths = []
+        self.collectPaths(paths)
+        referenceMap = resolvePaths(paths)  # resolve all traces and references in advance
+        referenceVersion = treeVersion
+        writer = TeXWriter(outfile)
         for i in texout:
-            if not isinstance(i, str):
-                i = "\n".join(i)
-            out += i
-        out = parseString(out)
-        outfile.writelines(out)
+            writer.append(i)
+        Node.genTeX(self, writer, 0, 1, "")
+        writer.append(r'\end{document}' + '\n')
+        writer.close()
+        referenceMap = None
         outfile.close()
-
-        os.system('pdflatex -shell-escape -synctex=1 -interaction=batchmode -output-directory=../doc/pdf/ ' + opfile)
-        print("")
-        os.system('pdflatex -shell-escape -synctex=1 -interaction=batchmode -output-directory=../doc/pdf/ ' + opfile)
-        print("")
-        for tmpRoot, dirs, files in os.walk(Document.path + "/pdf"):
-            for currentFile in files:
-                if log is True:
-                    exts = ['.aux', '.lof', '.out', '.toc', '.lot', '.gz']
-                else:
-                    exts = ['.aux', '.lof', '.out', '.toc', '.lot', '.gz', 'log']
-                if any(currentFile.lower().endswith(ext) for ext in exts):
-                    os.remove(os.path.join(tmpRoot, currentFile))
+        if hashFiles([opfile]) == hashFiles([opfile + '.new']):
+            os.remove(opfile + '.new')
+        else:
+            os.replace(opfile + '.new', opfile)
+        return opfile
 
     def genRst(self, index):
         vDir = os.path.abspath(Document.path + "/rst/")
@@ -1695,10 +2463,11 @@ class Element(Node):
                                     texout.append(r'\indent \textit{' + str(prop) + '}:')
                                     tmp = []
                                     for pathnode in value:
-                                        tmp.append(node(pathnode).name + "(" + node(pathnode).getLabel() + "-" +
-                                                   str(node(pathnode).id) + ")" +
-                                                   r' on page \pageref{' + node(pathnode).name +
-                                                   str(node(pathnode).id) + '}')
+                                        target = lookupNode(pathnode)
+                                        tmp.append(target.name + "(" + target.getLabel() + "-" +
+                                                   str(target.id) + ")" +
+                                                   r' on page \pageref{' + target.name +
+                                                   str(target.id) + '}')
                                     texout.append(", ".join(tmp))
                                 else:
                                     texout.append(r'\indent \textit{' + str(prop) + '}: ' + ', '.join(map(str, value)))
@@ -1734,6 +2503,14 @@ class Element(Node):
         texAry.append(self.tailTeX())
         Node.genTeX(self, texAry, level, index, number)
 
+    def collectPaths(self, paths):
+        for value in self.properties.values():
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, str) and item.find(r"/*/") != -1:
+                        paths.append(item)
+        Node.collectPaths(self, paths)
+
 
 class Link(Element):
     mnemonic = "LINK"
@@ -1779,6 +2556,10 @@ class TextElement(Element):
         # return self.text.safe_substitute()
         return self.text
 
+    def collectPaths(self, paths):
+        paths.extend(inlineReference.findall(self.text))
+        Element.collectPaths(self, paths)
+
 
 class Req(TextElement):
     """
@@ -1909,6 +2690,12 @@ class Table(TextElement):
         TextElement.__init__(self, caption, text, properties, pNode)
         self.table = table
 
+    def collectPaths(self, paths):
+        for line in self.table:
+            for cell in line:
+                paths.extend(inlineReference.findall(cell))
+        TextElement.collectPaths(self, paths)
+
     def bodyTeX(self):
         texOut = []
         isFloat = 'position' in self.properties and self.properties['position'] == 'float'
@@ -1951,6 +2738,9 @@ class Figure(TextElement):
     and is referenced by a text element. A figure has the default type 'information'.
     """
     mnemonic = "FIG"
+    # extensions tried by pdflatex (graphicx) for a file name without extension, in this order; EPS with epstopdf
+    graphicsExtensions = ['.pdf', '.png', '.jpg', '.mps', '.jpeg', '.jbig2', '.jb2', '.PDF', '.PNG', '.JPG', '.JPEG',
+                          '.JBIG2', '.JB2', '.eps']
 
     def __init__(self, caption, figure, text="", properties=None, pNode=None):
         """
@@ -1992,6 +2782,24 @@ class Figure(TextElement):
                 r'\end{figure}' + '\n\n')
         return texOut
 
+    def imageFile(self):
+        """ Returns the file name of the image as pdflatex includes it: a name without extension is completed by the
+        first extension in graphicsExtensions, for which the file exists (in the working directory or in
+        Document.imgPath, see graphicspath).
+
+        :return: file name or None
+        """
+        if self.figure is None or os.path.splitext(self.figure)[1]:
+            return self.figure
+        found = findImage(self.figure, [Document.imgPath])
+        return self.figure + os.path.splitext(found)[1] if found else self.figure
+
+    def collectImages(self, images):
+        image = self.imageFile()
+        if image is not None:
+            images.append(image)
+        Node.collectImages(self, images)
+
 
 class Model(Figure):
     """
@@ -2001,8 +2809,12 @@ class Model(Figure):
     implement the genDot method. Overwrite the addNode() method inherited from Node to enforce well-formedness
     rules. A model has the default type 'requirement'. The difference between a model and a figure is that all
     elements of a model are visible in the RE tree and can be accessed (linked, checked, etc.)
+
+    The image is rendered in the format imageFormat. PDF is included by pdflatex as it is (vector graphics), while
+    EPS ('eps') must be converted by pdflatex on each run, which requires -shell-escape.
     """
     mnemonic = "MOD"
+    imageFormat = 'pdf'
 
     def __init__(self, caption, text="", properties=None, pNode=None):
         """
@@ -2029,13 +2841,17 @@ class Model(Figure):
     def bodyTeX(self):
         tmpname = self.cleanFileName()
         dot = Digraph(comment=tmpname)
-        dot.format = 'eps'
+        dot.format = self.imageFormat
         # dot.charset = 'UTF-8'
         self.genDot(dot)
-        dot.render(Document.imgPath + tmpname, view=False)
-        self.figure = tmpname + '.eps'
+        renderDot(dot, Document.imgPath + tmpname, defer=True)
+        self.figure = tmpname + '.' + self.imageFormat
         return Figure.bodyTeX(self)
 
+    def collectImages(self, images):
+        images.append(self.cleanFileName() + '.' + self.imageFormat)
+        Node.collectImages(self, images)
+
     def genTeX(self, texAry, level, index, number):
         number = self.buildNumber(index, number)
         texAry.append(self.headTeX(level, number))
@@ -0,0 +1,454 @@
+import os
+import random
+
+import pytest
+
+import istar
+import ref
+from istar import *
+
+labels = [label for label in GoalModel.Label if label != 'None']
+
+
+@pytest.fixture(autouse=True)
+def workDir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ref.cursor = None  # the next World is a new tree
+
+
+def smallModel():
+    """
+    Actor A with a leaf, which breaks the softgoal Depender, which depends on the goal Dependee of actor B
+
+    :return: the SD model and its intentions by name
+    """
+    World("Test")
+    cd("./-")
+    sd = GoalModel("SD")
+    a = Actor("A", pNode=sd)
+    b = Actor("B", pNode=sd)
+    nodes = {'Leaf': Task("Leaf", pNode=a), 'Depender': SoftGoal("Depender", pNode=a),
+             'Top': SoftGoal("Top", pNode=a), 'Dependee': Goal("Dependee", pNode=b),
+             'Dependuum': Goal("Dependuum", pNode=sd)}
+    ContributionLink(nodes['Leaf'], nodes['Depender'], 'BREAK')
+    ContributionLink(nodes['Depender'], nodes['Top'], 'HELP')
+    DependencyLink(nodes['Dependee'], nodes['Depender'], nodes['Dependuum'])
+    return sd, nodes
+
+
+def randomModel(seed, size=30):
+    """
+    Random SD model with contributions and decompositions within the actors and acyclic dependencies between them
+
+    :param seed: seed of the random generator
+    :param size: maximal number of intentions
+    :return: the SD model, its intentions and the random generator
+    """
+    rnd = random.Random(seed)
+    World("W%d" % seed)
+    cd("./-")
+    sd = GoalModel("SD")
+    actors = [Actor("A%d" % a, pNode=sd) for a in range(rnd.randint(1, 4))]
+    types = [Goal, SoftGoal, Task, Resource]
+    nodes = [rnd.choice(types)("n%d" % k, pNode=rnd.choice(actors)) for k in range(rnd.randint(3, size))]
+    for k in range(rnd.randint(0, 40)):
+        i, j = sorted(rnd.sample(range(len(nodes)), 2))
+        begin, end = nodes[i], nodes[j]
+        if begin.parent is not end.parent:
+            continue
+        r = rnd.random()
+        try:
+            if r < 0.5:
+                ContributionLink(begin, end, rnd.choice(ContributionLink.types))
+            elif r < 0.8:
+                DecompositionLink(begin, end)
+            else:
+                MeanEndLink(begin, end)
+        except TypeError:
+            pass
+    for k in range(rnd.randint(0, 6)):
+        i, j = sorted(rnd.sample(range(len(nodes)), 2))
+        begin, end = nodes[i], nodes[j]
+        if begin.parent is end.parent or end.dependencyFrom is not None or end.contributionFrom or \
+                end.decompositionFrom:
+            continue
+        DependencyLink(begin, end, rnd.choice(types)("d%d" % k, pNode=sd))
+    sd.findLeaf()
+    for n in nodes:
+        if n.properties.get('NodeType') in ('leaf', 'depender') and rnd.random() < 0.7:
+            SetLabel("/*/" + n.name, rnd.choice(labels))
+    return sd, nodes, rnd
+
+
+def meetingScheduler():
+    """ Builds the goal models of meeting_scheduler.py with its initial labels
+
+    :return: the SD model
+    """
+    with open(os.path.join(os.path.dirname(__file__), 'meeting_scheduler.py')) as f:
+        source = f.read().split('node("/").genPDF()')[0]
+    exec(source, {'__name__': 'meeting_scheduler'})
+    for path, label in [('/*/Proposed Date D', 'Satisfied'), ('/*/Schedule Meeting', 'Denied'),
+                        ('/*/Merge Avail Dates', 'Satisfied'), ('/*/Attend Meeting', 'Satisfied'),
+                        ('/*/Find Agreeable Date By Talking To Initiator', 'Satisfied')]:
+        SetLabel(path, label)
+    return node("/*/SD-Model of Meeting Schedule")
+
+
+def evaluate(sd):
+    """ Repeats forwardEvaluation until the labels do not change anymore """
+    intentions = sd.collectIntentions([])
+    previous = None
+    while previous != [n.properties.get('Label') for n in intentions]:
+        previous = [n.properties.get('Label') for n in intentions]
+        sd.forwardEvaluation(interactive=False)
+
+
+def path(intention):
+    """ Returns an unambiguous path of the intention: its name below the names of its goal models """
+    names = [intention.name]
+    model = intention.parent
+    while isinstance(model, GoalModel):
+        names.insert(0, model.name)
+        model = model.parent
+    return '/*/' + '/*/'.join(names)
+
+
+def state(intentions):
+    return [(n.name, n.properties.get('Label'), n.properties.get('humanJudgment')) for n in intentions]
+
+
+def updates(build, seed, incremental):
+    """ Evaluates a model, changes random labels and judgments three times, and re-evaluates the model after each
+    change by updateEvaluation or by forwardEvaluation
+
+    :return: the labels and human judgments after each change
+    """
+    sd = build()
+    evaluate(sd)
+    intentions = sd.collectIntentions([])
+    rnd = random.Random(seed)
+    result = []
+    for step in range(3):
+        for n in rnd.sample(intentions, rnd.randint(1, 3)):
+            if isinstance(n, SoftGoal) and rnd.random() < 0.3:
+                MakeJudgement(path(n), rnd.choice(labels))
+            else:
+                SetLabel(path(n), rnd.choice(labels))
+        if incremental:
+            sd.updateEvaluation(interactive=False)
+        else:
+            evaluate(sd)
+        result.append(state(intentions))
+    return result
+
+
+def testChangedLabelsBelongToTheirModel():
+    """ Labels changed in one model are neither propagated nor kept by the model of another tree """
+    sd, nodes = smallModel()
+    SetLabel("/*/Leaf", 'Satisfied')
+    ref.cursor = None
+    other, otherNodes = smallModel()
+    assert list(sd.changedLabels) == [nodes['Leaf']] and not other.changedLabels
+    assert other.updateEvaluation(interactive=False) == OrderedDict()
+    assert sd.updateEvaluation(interactive=False) == OrderedDict([(nodes['Leaf'], (None, 'Satisfied'))])
+    assert not sd.changedLabels
+
+
+@pytest.mark.parametrize('seed', range(100))
+def testUpdateEvaluationRandomModel(seed):
+    expected = updates(lambda: randomModel(seed)[0], seed, False)
+    ref.cursor = None
+    assert updates(lambda: randomModel(seed)[0], seed, True) == expected
+
+
+@pytest.mark.parametrize('seed', range(10))
+def testUpdateEvaluationMeetingScheduler(seed):
+    expected = updates(meetingScheduler, seed, False)
+    ref.cursor = None
+    assert updates(meetingScheduler, seed, True) == expected
+
+
+def inPlace(build, scenario, judgments):
+    """ Evaluates a scenario in the model itself: SetLabel of its labels, MakeJudgement of the judgments, and
+    forwardEvaluation until the labels do not change anymore
+
+    :return: the label codes of the intentions
+    """
+    ref.cursor = None
+    sd = build()
+    sd.clearLabel()
+    intentions = sd.collectIntentions([])
+    for k, label in scenario.items():
+        SetLabel(path(intentions[k]), label)
+    for k, label in judgments.items():
+        MakeJudgement(path(intentions[k]), label)
+    evaluate(sd)
+    return [GoalModel.Label.get(n.properties.get('Label'), 0) for n in intentions]
+
+
+def scenarios(build, seed):
+    """ Evaluates random scenarios with evaluateScenarios, LabelNetwork.evaluate and in the model itself
+
+    :return: the label codes of the intentions in each scenario, by evaluateScenarios, evaluate and in place
+    """
+    rnd = random.Random(seed)
+    sd = build()
+    sd.clearLabel()
+    intentions = sd.collectIntentions([])
+    judgments = {k: rnd.choice(labels) for k, n in enumerate(intentions)
+                 if isinstance(n, SoftGoal) and rnd.random() < 0.2}
+    for k, label in judgments.items():
+        MakeJudgement(path(intentions[k]), label)
+    inputs = [{k: rnd.choice(labels) for k in range(len(intentions)) if rnd.random() < 0.3} for s in range(3)]
+    roots, result = sd.evaluateScenarios([{intentions[k]: label for k, label in scenario.items()}
+                                          for scenario in inputs], roots=intentions)
+    network = LabelNetwork(sd.freeze())
+    single = [network.evaluate([GoalModel.Label[scenario[k]] if k in scenario else 0
+                                for k in range(len(intentions))]) for scenario in inputs]
+    return [list(map(int, row)) for row in result], single, [inPlace(build, s, judgments) for s in inputs]
+
+
+@pytest.mark.parametrize('seed', range(50))
+def testEvaluateScenariosRandomModel(seed):
+    result, single, expected = scenarios(lambda: randomModel(seed)[0], seed)
+    assert result == expected
+    assert single == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def testEvaluateScenariosMeetingScheduler(seed):
+    result, single, expected = scenarios(meetingScheduler, seed)
+    assert result == expected
+    assert single == expected
+
+
+@pytest.mark.parametrize('seed', range(100))
+def testEvaluateParallelRandomModel(seed):
+    sd, nodes, rnd = randomModel(seed)
+    network = LabelNetwork(sd.freeze())
+    for scenario in range(5):
+        inputs = [GoalModel.Label[rnd.choice(labels)] if rnd.random() < 0.4 else 0 for k in network.model.names]
+        assert network.evaluateParallel(inputs) == network.evaluate(inputs)
+
+
+def actors(build, jobs):
+    """ Evaluates a model, which was not evaluated yet, frozen by jobs processes and in the model itself
+
+    :return: the labels of the frozen model and in place
+    """
+    sd = build()
+    result = [ContributionLink.labelNames[code] if code else None for code in sd.freeze().evaluate(jobs)]
+    ref.cursor = None
+    sd = build()
+    evaluate(sd)
+    return result, [n.properties.get('Label') for n in sd.collectIntentions([])]
+
+
+@pytest.mark.parametrize('seed', range(0, 100, 20))
+def testFrozenEvaluateJobsRandomModel(seed):
+    result, expected = actors(lambda: randomModel(seed)[0], 2)
+    assert result == expected
+
+
+def testFrozenEvaluateJobsMeetingScheduler():
+    result, expected = actors(meetingScheduler, 2)
+    assert result == expected
+
+
+def influencers(sd, root):
+    """ Returns the intentions, from which the root can be reached along contribution, decomposition and dependency
+    links, by a depth-first search backwards from the root """
+    dependees = sd.dependencyLinks()
+    found = {root}
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        sources = [link.begin for link in n.contributionFrom + n.decompositionFrom]
+        if n.dependencyFrom is not None and n.properties.get('NodeType') == 'depender':
+            sources += [n.dependencyFrom.dependuum, n.dependencyFrom.begin]
+        sources += [link.begin for link in dependees.get(n, [])]
+        for source in sources:
+            if source not in found:
+                found.add(source)
+                stack.append(source)
+    return found
+
+
+def sensitivity(sd):
+    """ Returns the sensitivity of the model and the leaves influencing each root by brute force """
+    influencing, affected = sd.sensitivity()
+    leaves = list(affected)
+    expected = {root: [leaf for leaf in leaves if leaf in influencers(sd, root)] for root in influencing}
+    assert {root: [leaf for leaf in leaves if root in affected[leaf]] for root in influencing} == expected
+    return dict(influencing), expected
+
+
+def sharedModel():
+    """
+    Actors A and B, whose roots share subtasks: Shared is decomposed into Sub and the leaf L2 and contributes to
+    the root R1 and, via Depender, to the root R2. Sub (decomposed into the leaf L1) is also part of R1. Depender
+    depends on the goal Dependee of B, which the leaf L3 makes
+
+    :return: the SD model
+    """
+    World("Test")
+    cd("./-")
+    sd = GoalModel("SD")
+    a = Actor("A", pNode=sd)
+    b = Actor("B", pNode=sd)
+    nodes = {name: Task(name, pNode=a) for name in ("L1", "L2", "Sub", "Shared", "R1")}
+    nodes.update({name: SoftGoal(name, pNode=a) for name in ("Depender", "R2")})
+    nodes.update({'L3': Task("L3", pNode=b), 'Dependee': Goal("Dependee", pNode=b)})
+    DecompositionLink(nodes['L1'], nodes['Sub'])
+    DecompositionLink(nodes['Sub'], nodes['Shared'])
+    DecompositionLink(nodes['L2'], nodes['Shared'])
+    DecompositionLink(nodes['Sub'], nodes['R1'])
+    ContributionLink(nodes['Shared'], nodes['R1'], 'HELP')
+    ContributionLink(nodes['Shared'], nodes['Depender'], 'HURT')
+    ContributionLink(nodes['Depender'], nodes['R2'], 'HELP')
+    ContributionLink(nodes['L3'], nodes['Dependee'], 'MAKE')
+    DependencyLink(nodes['Dependee'], nodes['Depender'], Goal("Dependuum", pNode=sd))
+    return sd
+
+
+def testSensitivitySharedSubgoals():
+    result, expected = sensitivity(sharedModel())
+    assert result == expected
+    assert {root.name: [leaf.name for leaf in leaves] for root, leaves in result.items()} == \
+        {'R1': ['L1', 'L2'], 'R2': ['L1', 'L2', 'L3']}
+
+
+def testSensitivityMeetingScheduler():
+    result, expected = sensitivity(meetingScheduler())
+    assert result == expected
+    assert all(result.values())
+
+
+@pytest.mark.parametrize('seed', range(50))
+def testSensitivityRandomModel(seed):
+    result, expected = sensitivity(randomModel(seed)[0])
+    assert result == expected
+
+
+def testWaitingDependerKeepsInputLabel():
+    sd, nodes = smallModel()
+    SetLabel("/*/Leaf", 'Satisfied')
+    SetLabel("/*/Depender", 'Partially Satisfied')
+    sd.forwardEvaluation(interactive=False)
+    assert nodes['Depender'].properties['Label'] == 'Partially Satisfied'
+    assert nodes['Top'].properties['Label'] == 'Unknown'
+    SetLabel("/*/Dependee", 'Satisfied')
+    sd.forwardEvaluation(interactive=False)
+    sd.forwardEvaluation(interactive=False)
+    assert nodes['Depender'].properties['Label'] == 'Unknown'
+    assert nodes['Depender'].properties['humanJudgment'] == 'need'
+
+
+def testTaskRecordsFirstLabel():
+    """ A task is as bad as the worst of its subtasks, also if that one delivers its label first """
+    World("Test")
+    cd("./-")
+    sd = GoalModel("SD")
+    a = Actor("A", pNode=sd)
+    top = Task("Top", pNode=a)
+    for name, label in (("First", 'Denied'), ("Second", 'Satisfied')):
+        DecompositionLink(Task(name, pNode=a), top)
+        SetLabel("/*/" + name, label)
+    sd.forwardEvaluation(interactive=False)
+    assert top.properties['Label'] == 'Denied'
+
+
+def cyclicModel(typeX, typeY, typeXY, typeYX, label):
+    """
+    Actor A with a goal Leaf, which makes X, a cycle of X and Y, and Top, which Y helps
+
+    :return: the SD model and its intentions by name
+    """
+    World("Test")
+    cd("./-")
+    sd = GoalModel("SD")
+    a = Actor("A", pNode=sd)
+    nodes = {'Leaf': Goal("Leaf", pNode=a), 'X': typeX("X", pNode=a), 'Y': typeY("Y", pNode=a),
+             'Top': SoftGoal("Top", pNode=a)}
+    ContributionLink(nodes['Leaf'], nodes['X'], 'MAKE')
+    ContributionLink(nodes['X'], nodes['Y'], typeXY)
+    ContributionLink(nodes['Y'], nodes['X'], typeYX)
+    ContributionLink(nodes['Y'], nodes['Top'], 'HELP')
+    SetLabel("/*/Leaf", label)
+    return sd, nodes
+
+
+@pytest.fixture
+def noImages(monkeypatch):
+    """ PropagateLabel shows the evaluated actors """
+    monkeypatch.setattr(Actor, 'genImage', lambda self, overwrite=True, show=False, defer=False: None)
+
+
+def testConvergingCycle(noImages):
+    sd, nodes = cyclicModel(SoftGoal, SoftGoal, 'HELP', 'HELP', 'Satisfied')
+    assert PropagateLabel("/*/SD", fixpoint=True) == []
+    assert [nodes[n].properties['Label'] for n in ('X', 'Y', 'Top')] == \
+           ['Satisfied', 'Partially Satisfied', 'Partially Satisfied']
+
+
+def testDivergingCycle(noImages):
+    """ The goal X is made denied and broken by the softgoal Y it makes, which flips the labels of X and Y """
+    sd, nodes = cyclicModel(Goal, SoftGoal, 'MAKE', 'BREAK', 'Denied')
+    assert PropagateLabel("/*/SD", fixpoint=True, maxIterations=5) == [[nodes['X'], nodes['Y']]]
+
+
+def testCycleWithoutFixpoint():
+    """ The error names the intentions of the cycle, but not Top after it """
+    sd, nodes = cyclicModel(SoftGoal, SoftGoal, 'HELP', 'HELP', 'Satisfied')
+    with pytest.raises(AttributeError, match=r"through the cycles: X, Y \("):
+        sd.forwardEvaluation(interactive=False)
+
+
+def contributionLinks():
+    """ Returns an SD model with a contribution link of each type from a leaf of each label (including none), and
+    the links """
+    World("Test")
+    cd("./-")
+    sd = GoalModel("SD")
+    a = Actor("A", pNode=sd)
+    links = []
+    for label in ContributionLink.labelNames:
+        begin = Goal("Begin " + label, pNode=a)
+        if label != 'None':
+            SetLabel("/*/" + begin.name, label)
+        for TYPE in ContributionLink.types:
+            links.append(ContributionLink(begin, SoftGoal(label + " " + TYPE, pNode=a), TYPE))
+    return sd, links
+
+
+def testContributionTable():
+    for i, label in enumerate(ContributionLink.labelNames):
+        assert GoalModel.Label[label] == i
+        for j, TYPE in enumerate(ContributionLink.types):
+            assert ContributionLink.labelNames[ContributionLink.labelTable[i][j]] == \
+                ContributionLink.contribute(label, TYPE)
+    if numpy is not None:
+        assert ContributionLink.labelMatrix.tolist() == ContributionLink.labelTable
+
+
+@pytest.mark.parametrize('vectorized', [True, False])
+def testComputeLabels(vectorized, monkeypatch):
+    """ The contributed labels agree with contribute, looked up with NumPy (for any number of links) and without
+    it, link by link, for all links, and in frozen models """
+    if vectorized:
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(ContributionLink, 'batchSize', 1)
+    else:
+        monkeypatch.setattr(istar, 'numpy', None)
+    sd, links = contributionLinks()
+    expected = [ContributionLink.contribute(link.begin.properties.get('Label', 'None'), link.type) for link in links]
+    assert [link.computeLabel() for link in links] == expected
+    assert ContributionLink.computeLabels(links) == expected
+    codes = [GoalModel.Label[label] for label in expected]
+    position = {n: k for k, n in enumerate(sd.collectIntentions([]))}
+    labels = sd.freeze().evaluate()
+    assert [labels[position[link.end]] for link in links] == codes
+    scenario = {n: n.properties['InputLabel'] for n in position if 'InputLabel' in n.properties}
+    roots, labels = sd.evaluateScenarios([scenario], roots=[link.end for link in links])
+    assert [int(code) for code in labels[0]] == codes
@@ -0,0 +1,84 @@
+import os
+import subprocess
+
+import pytest
+
+import ref
+from plantuml import *
+
+
+@pytest.fixture(autouse=True)
+def workDir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Document, 'imgPath', 'images/')
+    os.makedirs(Document.imgPath)
+    ref.cursor = None  # the next World is a new tree
+    pendingDiagrams.clear()
+
+
+def testBrokenDiagramIsRenderedAlone(monkeypatch):
+    """ A run on all diagrams fails on a broken one, the others are rendered one by one and cached """
+    runs = []
+
+    def run(command, check):
+        files = command[3:]
+        runs.append(files)
+        if any('broken' in f for f in files):
+            return subprocess.CompletedProcess(command, 1)
+        for f in files:
+            open(f[:-3] + 'png', 'w').close()
+        return subprocess.CompletedProcess(command, 0)
+    monkeypatch.setattr(subprocess, 'run', run)
+    for name in ('a', 'broken', 'b'):
+        with open(Document.imgPath + name + '.txt', 'w') as f:
+            f.write(name)
+        pendingDiagrams[Document.imgPath + name + '.txt'] = (name, Document.imgPath + name + '.png')
+    renderPendingDiagrams()
+    assert runs == [['images/a.txt', 'images/broken.txt', 'images/b.txt'], ['images/a.txt'], ['images/broken.txt'],
+                    ['images/b.txt']]
+    assert sorted(os.listdir(Document.imgPath)) == ['.cache', 'a.png', 'a.txt', 'b.png', 'b.txt', 'broken.txt']
+    assert len(os.listdir(renderCache.directory())) == 2
+    assert not pendingDiagrams
+
+
+def testMissingJava(monkeypatch):
+    def run(command, check):
+        raise FileNotFoundError(command[0])
+    monkeypatch.setattr(subprocess, 'run', run)
+    pendingDiagrams[Document.imgPath + 'a.txt'] = ('a', Document.imgPath + 'a.png')
+    renderPendingDiagrams()
+    assert not pendingDiagrams and not os.path.isdir(renderCache.directory())
+
+
+def testHangingWorkerIsRestarted(monkeypatch):
+    """ A worker, which does not respond in time, is killed, reaped, and replaced by a new process """
+    started = []
+
+    class Process(object):
+        def __init__(self, command, stdin, stdout, stderr):
+            self.stdin = open(os.devnull, 'wb')
+            self.stdout = open(os.devnull, 'rb')
+            self.returncode = None
+            self.calls = []
+            started.append(self)
+
+        def poll(self):
+            return self.returncode
+
+        def wait(self, timeout=None):
+            self.calls.append('wait')
+            if self.returncode is None:
+                raise subprocess.TimeoutExpired('java', timeout)
+            return self.returncode
+
+        def kill(self):
+            self.calls.append('kill')
+            self.returncode = -9
+    monkeypatch.setattr(subprocess, 'Popen', Process)
+    monkeypatch.setattr(PlantUMLWorker, 'readOutput', staticmethod(lambda stdout, output: None))
+    worker = PlantUMLWorker(timeout=0.01)
+    worker.start()
+    with pytest.raises(OSError):
+        worker.renderImage('@startuml\nA -> B\n@enduml\n')
+    assert started[0].calls == ['wait', 'kill', 'wait']
+    assert len(started) == 2 and worker.process is started[1] and worker.isRunning()
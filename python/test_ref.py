@@ -0,0 +1,196 @@
+import os
+import random
+
+import pytest
+
+import ref
+from ref import *
+
+
+@pytest.fixture(autouse=True)
+def workDir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Document, 'imgPath', 'images/')
+    ref.cursor = None  # the next World is a new tree
+
+
+def testCollectImagesResolvesExtension():
+    os.makedirs(Document.imgPath)
+    for name in ('a.eps', 'b.eps', 'b.png', 'c.jpg'):
+        open(Document.imgPath + name, 'w').close()
+    world = World("W")
+    for caption, figure in (('A', 'a'), ('B', 'b'), ('C', 'c.jpg'), ('D', 'd')):
+        Figure(caption, figure, pNode=world)
+    images = []
+    world.collectImages(images)
+    assert images == ['a.eps', 'b.png', 'c.jpg', 'd']
+
+
+def build(texFile):
+    """ Records a build of the LaTeX file in the manifest, as genPDF does after pdflatex succeeded """
+    open(os.path.splitext(texFile)[0] + '.pdf', 'w').close()
+    manifest = BuildManifest('.')
+    manifest.update(texFile)
+    manifest.save()
+
+
+def testManifestResolvesImages():
+    """ The manifest hashes an image included without extension, so that changing the image rebuilds the PDF """
+    os.makedirs(Document.imgPath)
+    with open(Document.imgPath + 'fig.png', 'w') as f:
+        f.write('png')
+    with open('doc.tex', 'w', encoding='utf-8') as f:
+        f.write(r'\graphicspath{{' + Document.imgPath + r'}}' + '\n' + r'\includegraphics{fig}' + '\n')
+    assert BuildManifest('.').inputs('doc.tex')['images']['fig'] is not None
+    build('doc.tex')
+    assert not BuildManifest('.').changed('doc.tex')
+    with open(Document.imgPath + 'fig.png', 'w') as f:
+        f.write('changed png')
+    assert BuildManifest('.').changed('doc.tex')
+    build('doc.tex')
+    open(Document.imgPath + 'fig.pdf', 'w').close()  # included instead of fig.png
+    assert BuildManifest('.').changed('doc.tex')
+
+
+def pdflatex(command):
+    """ Stands in for pdflatex: writes the PDF of Good.tex into the output directory and fails on any other file """
+    outputDir, texFile = command.split('-output-directory=')[1].split(' ')
+    if os.path.basename(texFile) != 'Good.tex':
+        return 1
+    open(os.path.join(outputDir, 'Good.pdf'), 'w').close()
+    return 0
+
+
+def testFailedBuildIsNotRecorded(monkeypatch):
+    """ A document pdflatex fails on is neither returned nor recorded in the manifest, so it is built again """
+    monkeypatch.setattr(Document, 'path', 'doc')
+    monkeypatch.setattr(os, 'system', pdflatex)
+    world = World("W")
+    for name in ("Good", "Bad"):
+        Document(name, "Specification", "SPEC", [["Author"]], {}, world)
+    assert world.genPDF() == [os.path.abspath('doc/pdf/Good.pdf')]
+    assert sorted(BuildManifest('doc').entries) == ['pdf/Good.tex']
+    assert world.genPDF() == []
+    assert compilePDF('doc/pdf/Bad.tex') is None
+
+
+def randomTree(seed, steps=300):
+    """
+    Builds a random tree by adding, removing, moving, cloning, and renaming nodes, and checks after each step that
+    path expressions resolve through the name index to the node found by a depth-first scan
+
+    :param seed: seed of the random generator
+    :param steps: number of changes of the tree
+    """
+    rnd = random.Random(seed)
+    world = World("W")
+
+    def nodes():
+        found = []
+        stack = [world]
+        while stack:
+            n = stack.pop()
+            found.append(n)
+            stack.extend(n.nodes)
+        return found
+
+    def scan(start, name, nextLevel):
+        """ Returns the first node of the subtree in depth-first order, whose name starts with name """
+        stack = list(reversed(start.nodes)) if nextLevel else [start]
+        while stack:
+            n = stack.pop()
+            if n.name.startswith(name):
+                return n
+            stack.extend(reversed(n.nodes))
+        return None
+
+    def below(n, destination):
+        while destination is not None and destination is not n:
+            destination = destination.parent
+        return destination is n
+
+    for step in range(steps):
+        r = rnd.random()
+        tree = nodes()
+        n, destination = rnd.choice(tree), rnd.choice(tree)
+        name = "%s%d" % (rnd.choice("abc"), rnd.randint(0, 30))
+        if r < 0.5:
+            try:
+                Context(name, destination)
+            except AttributeError:  # duplicate name
+                pass
+        elif n is world:
+            continue
+        elif r < 0.6:
+            rm(n)
+        elif r < 0.7:
+            if not below(n, destination) and all(m.name != n.name for m in destination.nodes if m is not n):
+                mv(n, destination, rnd.choice([None, 0, 1, 2]))
+        elif r < 0.75:
+            if not below(n, destination):
+                clone(n, destination, rnd.choice([None, 0, 1]))
+        elif r < 0.8:
+            n.setNode('name', name)
+        start = rnd.choice(nodes())
+        name = rnd.choice(["", "a", "b", "c", "a1", "b2", name])
+        nextLevel = rnd.random() < 0.5
+        assert start.getNodeByName(name, nextLevel) is scan(start, name, nextLevel)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def testPathResolution(seed):
+    randomTree(seed)
+
+
+markupCases = [
+    ("The robot has **bold text** and *italic* words.",
+     r"The robot has \textbf{bold text} and \textit{italic} words."),
+    ("See `Python <http://www.python.org/>`_ for details.",
+     r"See \href{http://www.python.org/}{Python } for details."),
+    ("As in `/*/Power`_ and `/*/Clean`_.",
+     r"As in   Power (ID-2) on page \pageref{Power2}  and   Clean (ID-3) on page \pageref{Clean3} ."),
+    ("The noise (*dB(A)*) is low.",
+     r"The noise (\textit{dB(A)}) is low."),
+    ("A list, **strong**: a_b 100% x & y\n",
+     "A list, \\textbf{strong}: a\\_b 100\\% x \\& y\n"),
+    ("*italic* at the start",  # emphasis needs a space or bracket before it
+     "*italic* at the start"),
+    ("word",
+     "word"),
+]
+
+
+@pytest.mark.parametrize('text, expected', markupCases)
+def testMarkupTokenizer(text, expected):
+    """ The single scan converts emphasis, links and references (after escaping, see getUnicodeStr) """
+    World("W")
+    cd("./-")
+    Req("Power", "The suction power must not exceed a given threshold.")
+    Req("Clean", "The robot shall clean the apartment at night.")
+    assert convertMarkup(getUnicodeStr(text), {}) == expected
+
+
+itemizeCases = [
+    ("* a\n* b",
+     "\n\n\\begin{itemize}\n\\item a\n\\item b\n\\end{itemize}\n"),
+    ("* item 0\n  continued\n* item 1",
+     "\n\n\\begin{itemize}\n\\item item 0\n  continued\n\\item item 1\n\\end{itemize}\n"),
+    ("* a\n* b\n  * nested 0\n  * nested 1",
+     "\n\n\\begin{itemize}\n\\item a\n\\item b\n  \\begin{itemize}\n   \\item nested 0\n  \\item nested 1\n"
+     "\\end{itemize}\n\\end{itemize}\n"),
+    ("Some text\n\n* a\n* b",
+     "\nSome text\n\n\n\\begin{itemize}\n\\item a\n\\item b\n\\end{itemize}\n"),
+    ("* a\n\n* b\n  * c",
+     "\n\n\\begin{itemize}\n\\item a\n\\end{itemize}\n\n\n\n\\begin{itemize}\n\\item b\n  \\begin{itemize}\n"
+     "   \\item c\n\\end{itemize}\n\\end{itemize}\n"),
+    # the nested list is closed before the next item of the outer list
+    ("* a\n  * b\n* c",
+     "\n\n\\begin{itemize}\n\\item a\n  \\begin{itemize}\n   \\item b\n\\end{itemize}\n \\item c\n\\end{itemize}\n"),
+    ("No list here",
+     "\nNo list here"),
+]
+
+
+@pytest.mark.parametrize('text, expected', itemizeCases)
+def testItemize(text, expected):
+    assert convertItemize(text) == expected